@@ -1,13 +1,31 @@
 import asyncio
-import json
 import logging
+from collections import deque
 from typing import AsyncIterator, Dict, Any, Optional, List
+from urllib.parse import urlsplit
 import httpx
+import orjson
+import simdjson
 
 from .base_client import BaseLLMClient
 
 logger = logging.getLogger(__name__)
 
+# One shared HTTP client per endpoint host, so multiple client instances
+# talking to the same server multiplex over one connection pool instead of
+# fragmenting sockets across per-instance pools
+_CLIENTS: Dict[str, httpx.AsyncClient] = {}
+_CLIENTS_LOCK = asyncio.Lock()
+
+
+async def close_all_clients() -> None:
+    """Close every shared HTTP client. Call once at application shutdown."""
+    async with _CLIENTS_LOCK:
+        for client in _CLIENTS.values():
+            if not client.is_closed:
+                await client.aclose()
+        _CLIENTS.clear()
+
 class CustomLLMClient(BaseLLMClient):
     """
     Generic LLM client that can work with any OpenAI-compatible API endpoint.
@@ -60,65 +78,173 @@ class CustomLLMClient(BaseLLMClient):
         
         self.response_path = response_path.split('.')
         self.stream_response_path = stream_response_path.split('.')
-        
+
+        # Compile both JSONPaths once; the streaming extractor runs per chunk
+        self._extract_response = self._compile_path(self.response_path)
+        self._extract_stream = self._compile_path(self.stream_response_path)
+
+        # Reusable lazy parser for non-streaming bodies; at_pointer reads the
+        # configured field without materializing the whole response as dicts
+        self._simd_parser = simdjson.Parser()
+        self._response_pointer = "/" + "/".join(self.response_path)
+
+        # Serialize the static part of the request template once. Per-request
+        # bodies are then built by byte-concatenating this prefix with the
+        # serialized dynamic fields, avoiding a dict copy + full re-encode
+        self._uses_messages = "messages" in self.request_template
+        dynamic_keys = ("messages" if self._uses_messages else "prompt", "stream")
+        static_body = {
+            k: v for k, v in self.request_template.items() if k not in dynamic_keys
+        }
+        self._body_prefix = orjson.dumps(static_body)[:-1]
+        if static_body:
+            self._body_prefix += b","
+
+        # Small pool of reusable scratch buffers for body assembly. Buffers
+        # are checked out per call (concurrent requests on one client must
+        # not share a buffer) and returned once serialized
+        self._buf_pool: deque = deque(bytearray(4096) for _ in range(4))
+
+        # Precompute the diagnostics payload; headers are masked once here
+        # instead of on every get_client_info call
+        self._headers_masked = {
+            k: ("***" if "auth" in k.lower() else v) for k, v in self.headers.items()
+        }
+        self._info = {
+            "type": "custom_llm",
+            "endpoint_url": self.endpoint_url,
+            "model_name": self.model_name,
+            "has_api_key": bool(self.api_key),
+            "headers": self._headers_masked,
+            "request_template": self.request_template
+        }
+
+        # Shared HTTP clients are pooled per endpoint host; remember our key
+        self._client_key = urlsplit(self.endpoint_url).netloc
+
         logger.info(f"Custom LLM client initialized for {endpoint_url} with model {model_name}")
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get (or lazily create) the shared HTTP client for our endpoint host.
+
+        All instances talking to the same host share one connection pool;
+        instance-specific headers and timeout are applied per request.
+        """
+        client = _CLIENTS.get(self._client_key)
+        if client is not None and not client.is_closed:
+            return client
+
+        async with _CLIENTS_LOCK:
+            client = _CLIENTS.get(self._client_key)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=64,
+                        max_connections=256
+                    )
+                )
+                _CLIENTS[self._client_key] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client for this endpoint host."""
+        async with _CLIENTS_LOCK:
+            client = _CLIENTS.pop(self._client_key, None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    async def __aenter__(self) -> "CustomLLMClient":
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
     
+    @staticmethod
+    def _compile_path(path: List[str]):
+        """Compile a dot-separated JSONPath into a specialized extractor.
+
+        The digit/key dispatch is resolved once here instead of on every
+        response and every streaming chunk.
+        """
+        steps = [int(p) if p.isdigit() else p for p in path]
+
+        def extract(data: Dict) -> Optional[str]:
+            try:
+                for step in steps:
+                    data = data[step]
+                return data
+            except (KeyError, IndexError, TypeError):
+                return None
+
+        return extract
+
     def _extract_from_response(self, response_data: Dict, path: List[str]) -> Optional[str]:
         """Extract content from response using JSONPath."""
-        try:
-            current = response_data
-            for key in path:
-                if key.isdigit():
-                    current = current[int(key)]
-                else:
-                    current = current[key]
-            return current
-        except (KeyError, IndexError, TypeError):
-            return None
+        return self._compile_path(path)(response_data)
     
-    def _build_request_body(self, prompt: str, stream: bool = False, **kwargs) -> Dict[str, Any]:
-        """Build the request body based on the template."""
-        request_body = self.request_template.copy()
-        
+    def _build_request_body(self, prompt: str, stream: bool = False, **kwargs) -> bytes:
+        """Build the serialized request body from the prebuilt skeleton."""
         # Handle messages format (OpenAI style)
-        if "messages" in request_body:
-            request_body["messages"] = [
-                {"role": "user", "content": prompt}
-            ]
+        if self._uses_messages:
+            dynamic: Dict[str, Any] = {
+                "messages": [{"role": "user", "content": prompt}]
+            }
         else:
             # Fallback for non-OpenAI APIs
-            request_body["prompt"] = prompt
-        
+            dynamic = {"prompt": prompt}
+
         # Add streaming flag
-        request_body["stream"] = stream
-        
+        dynamic["stream"] = stream
+
         # Override with any custom parameters
-        request_body.update(kwargs)
-        
-        return request_body
+        dynamic.update(kwargs)
+
+        tail = orjson.dumps(dynamic)
+        try:
+            buf = self._buf_pool.popleft()
+        except IndexError:
+            buf = bytearray(4096)
+        try:
+            buf.clear()
+            buf += self._body_prefix
+            buf += memoryview(tail)[1:]
+            return bytes(buf)
+        finally:
+            self._buf_pool.append(buf)
     
     async def generate_response(self, prompt: str, **kwargs) -> str:
         """Generate a non-streaming response."""
         try:
             request_body = self._build_request_body(prompt, stream=False, **kwargs)
-            
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self.endpoint_url,
-                    json=request_body,
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                
-                response_data = response.json()
-                content = self._extract_from_response(response_data, self.response_path)
-                
-                if content is None:
-                    logger.error(f"Could not extract content from response: {response_data}")
-                    return "Error: Could not parse LLM response"
-                
-                return content
-                
+
+            client = await self._get_client()
+            response = await client.post(
+                self.endpoint_url,
+                content=request_body,
+                headers=self.headers,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+
+            try:
+                doc = self._simd_parser.parse(response.content)
+                content = doc.at_pointer(self._response_pointer)
+            except (ValueError, KeyError, IndexError, TypeError):
+                # Field missing or body unparsable lazily; fall back to a
+                # full decode so the error path can log the whole payload
+                content = self._extract_response(orjson.loads(response.content))
+
+            # Outside the except: a JSON null content (e.g. a tool-call
+            # style reply) resolves fine on the fast path too and must
+            # get the same error handling as a missing field
+            if content is None:
+                logger.error(f"Could not extract content from response: {response.content!r}")
+                return "Error: Could not parse LLM response"
+
+            return content
+
         except httpx.HTTPError as e:
             logger.error(f"HTTP error calling custom LLM: {e}")
             raise Exception(f"LLM API error: {str(e)}")
@@ -130,32 +256,54 @@ class CustomLLMClient(BaseLLMClient):
         """Generate a streaming response."""
         try:
             request_body = self._build_request_body(prompt, stream=True, **kwargs)
-            
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    self.endpoint_url,
-                    json=request_body,
-                    headers=self.headers
-                ) as response:
-                    response.raise_for_status()
-                    
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]  # Remove "data: " prefix
-                            
-                            if data_str.strip() == "[DONE]":
-                                break
-                            
-                            try:
-                                data = json.loads(data_str)
-                                content = self._extract_from_response(data, self.stream_response_path)
-                                
-                                if content:
-                                    yield content
-                            except json.JSONDecodeError:
-                                continue
-                                
+
+            client = await self._get_client()
+            async with client.stream(
+                "POST",
+                self.endpoint_url,
+                content=request_body,
+                headers=self.headers,
+                timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+
+                # Parse SSE lines over raw bytes: accumulate chunks in a
+                # bytearray and split on newlines ourselves, so no per-line
+                # str decode/allocation happens before orjson sees the payload
+                buf = bytearray(8192)
+                buf.clear()
+                async for chunk in response.aiter_bytes():
+                    buf.extend(chunk)
+                    # Frame every complete line in this chunk with a single
+                    # C-level split instead of a find/delete pass per line
+                    last_nl = buf.rfind(b"\n")
+                    if last_nl == -1:
+                        continue
+                    lines = bytes(buf[:last_nl]).split(b"\n")
+                    del buf[:last_nl + 1]
+                    for line in lines:
+                        if not line.startswith(b"data: "):
+                            continue
+                        payload = line[6:]  # Remove "data: " prefix
+
+                        # Sentinel check without a full strip() allocation;
+                        # only a trailing \r (CRLF framing) or stray blanks
+                        # can follow the token
+                        if payload == b"[DONE]" or payload.rstrip(b" \t\r") == b"[DONE]":
+                            return
+
+                        try:
+                            data = orjson.loads(payload)
+                        except orjson.JSONDecodeError:
+                            # Lines are only framed once newline-terminated,
+                            # so this payload is malformed rather than split
+                            # across chunks; drop it and keep streaming
+                            continue
+
+                        content = self._extract_stream(data)
+                        if content:
+                            yield content
+
         except httpx.HTTPError as e:
             logger.error(f"HTTP error in streaming response: {e}")
             yield f"Error: {str(e)}"
@@ -165,14 +313,7 @@ class CustomLLMClient(BaseLLMClient):
     
     def get_client_info(self) -> Dict[str, Any]:
         """Get information about this client."""
-        return {
-            "type": "custom_llm",
-            "endpoint_url": self.endpoint_url,
-            "model_name": self.model_name,
-            "has_api_key": bool(self.api_key),
-            "headers": {k: ("***" if "auth" in k.lower() else v) for k, v in self.headers.items()},
-            "request_template": self.request_template
-        }
+        return dict(self._info)
 
 
 class OllamaClient(CustomLLMClient):
@@ -236,6 +377,50 @@ class OpenAICompatibleClient(CustomLLMClient):
         )
 
 
+# Per-provider constructors; each validates its own required arguments
+def _make_ollama(model_name, endpoint_url, api_key, **kwargs) -> BaseLLMClient:
+    base_url = endpoint_url or "http://localhost:11434"
+    return OllamaClient(model_name=model_name, base_url=base_url, **kwargs)
+
+
+def _make_lmstudio(model_name, endpoint_url, api_key, **kwargs) -> BaseLLMClient:
+    base_url = endpoint_url or "http://localhost:1234"
+    return LMStudioClient(model_name=model_name, base_url=base_url, **kwargs)
+
+
+def _make_openai_compatible(model_name, endpoint_url, api_key, **kwargs) -> BaseLLMClient:
+    if not endpoint_url:
+        raise ValueError("endpoint_url is required for openai-compatible provider")
+    if not api_key:
+        raise ValueError("api_key is required for openai-compatible provider")
+    return OpenAICompatibleClient(
+        endpoint_url=endpoint_url,
+        model_name=model_name,
+        api_key=api_key,
+        **kwargs
+    )
+
+
+def _make_custom(model_name, endpoint_url, api_key, **kwargs) -> BaseLLMClient:
+    if not endpoint_url:
+        raise ValueError("endpoint_url is required for custom provider")
+    return CustomLLMClient(
+        endpoint_url=endpoint_url,
+        model_name=model_name,
+        api_key=api_key,
+        **kwargs
+    )
+
+
+# Dispatch table: O(1) lookup instead of an if/elif chain per call
+_PROVIDERS = {
+    "ollama": _make_ollama,
+    "lmstudio": _make_lmstudio,
+    "openai-compatible": _make_openai_compatible,
+    "custom": _make_custom,
+}
+
+
 # Factory function for easy client creation
 def create_custom_llm_client(
     provider: str,
@@ -246,48 +431,25 @@ def create_custom_llm_client(
 ) -> BaseLLMClient:
     """
     Factory function to create LLM clients based on provider.
-    
+
     Args:
         provider: Provider type ("ollama", "lmstudio", "openai-compatible", "custom")
         model_name: Model identifier
         endpoint_url: API endpoint URL (required for some providers)
         api_key: API key (if required)
         **kwargs: Additional client parameters
-    
+
     Returns:
         Configured LLM client
     """
-    provider = provider.lower()
-    
-    if provider == "ollama":
-        base_url = endpoint_url or "http://localhost:11434"
-        return OllamaClient(model_name=model_name, base_url=base_url, **kwargs)
-    
-    elif provider == "lmstudio":
-        base_url = endpoint_url or "http://localhost:1234"
-        return LMStudioClient(model_name=model_name, base_url=base_url, **kwargs)
-    
-    elif provider == "openai-compatible":
-        if not endpoint_url:
-            raise ValueError("endpoint_url is required for openai-compatible provider")
-        if not api_key:
-            raise ValueError("api_key is required for openai-compatible provider")
-        return OpenAICompatibleClient(
-            endpoint_url=endpoint_url,
-            model_name=model_name,
-            api_key=api_key,
-            **kwargs
+    factory = _PROVIDERS.get(provider.lower())
+    if factory is None:
+        raise ValueError(
+            f"Unsupported provider: {provider}. Supported: {', '.join(_PROVIDERS)}"
         )
-    
-    elif provider == "custom":
-        if not endpoint_url:
-            raise ValueError("endpoint_url is required for custom provider")
-        return CustomLLMClient(
-            endpoint_url=endpoint_url,
-            model_name=model_name,
-            api_key=api_key,
-            **kwargs
-        )
-    
-    else:
-        raise ValueError(f"Unsupported provider: {provider}. Supported: ollama, lmstudio, openai-compatible, custom")
+    return factory(
+        model_name=model_name,
+        endpoint_url=endpoint_url,
+        api_key=api_key,
+        **kwargs
+    )
@@ -1,5 +1,7 @@
 import google.generativeai as genai
 from typing import List, Dict, Any, AsyncIterator
+import concurrent.futures
+import io
 import logging
 import asyncio
 from ..config import settings
@@ -7,6 +9,13 @@ from .base_client import BaseLLMClient
 
 logger = logging.getLogger(__name__)
 
+# Dedicated pool for blocking Gemini SDK calls so long generations don't
+# compete with other blocking work on the loop's default executor
+_GEMINI_EXEC = concurrent.futures.ThreadPoolExecutor(
+    max_workers=16,
+    thread_name_prefix="gemini"
+)
+
 class GeminiClient(BaseLLMClient):
     """Client for interacting with Google Gemini AI."""
     
@@ -14,6 +23,10 @@ class GeminiClient(BaseLLMClient):
         self.api_key = api_key
         self.model = None
         self._initialize_client()
+        # The system prompt is constant; build it and the full-prompt prefix
+        # once instead of on every request
+        self._system_prompt = self._build_system_prompt()
+        self._system_prefix = f"{self._system_prompt}\n\n"
     
     def _initialize_client(self) -> None:
         """Initialize the Gemini client."""
@@ -30,7 +43,6 @@ class GeminiClient(BaseLLMClient):
         except Exception as e:
             logger.error(f"Failed to initialize Gemini client: {e}")
             raise
-            raise
     
     def _build_system_prompt(self) -> str:
         """Build the system prompt for the RAG system."""
@@ -65,47 +77,49 @@ Response guidelines:
         chat_history: List[Dict[str, Any]] = None
     ) -> str:
         """Build the user prompt with context and history."""
-        prompt_parts = []
-        
+        # Write into a single StringIO buffer rather than appending many
+        # small strings and joining; large contexts produce hundreds of parts
+        buf = io.StringIO()
+        w = buf.write
+
         # Add chat history if available
         if chat_history:
-            prompt_parts.append("=== PREVIOUS CONVERSATION ===")
+            w("=== PREVIOUS CONVERSATION ===\n")
             for msg in chat_history[-5:]:  # Include last 5 messages
                 role = msg.get('role', 'unknown')
                 content = msg.get('content', '')
-                timestamp = msg.get('timestamp', '')
-                prompt_parts.append(f"{role.upper()}: {content}")
-            prompt_parts.append("")
-        
+                w(f"{role.upper()}: {content}\n")
+            w("\n")
+
         # Add context documents
         if context_documents:
-            prompt_parts.append("=== RELEVANT DATA FROM YOUR DATABASE ===")
+            w("=== RELEVANT DATA FROM YOUR DATABASE ===\n")
             for i, doc in enumerate(context_documents, 1):
                 metadata = doc.get('metadata', {})
                 content = doc.get('content', '')
-                
-                prompt_parts.append(f"Document {i}:")
-                prompt_parts.append(f"Content: {content}")
-                
+
+                w(f"Document {i}:\nContent: {content}\n")
+
                 if metadata:
-                    prompt_parts.append("Raw Data:")
-                    for key, value in metadata.items():
-                        if value is not None:
-                            prompt_parts.append(f"  - {key}: {value}")
-                
-                prompt_parts.append("")
+                    w("Raw Data:\n")
+                    w("".join(
+                        f"  - {key}: {value}\n"
+                        for key, value in metadata.items()
+                        if value is not None
+                    ))
+
+                w("\n")
         else:
-            prompt_parts.append("=== NO RELEVANT DATA FOUND ===")
-            prompt_parts.append("Note: No relevant data was found in your database for this question.")
-            prompt_parts.append("")
-        
+            w("=== NO RELEVANT DATA FOUND ===\n")
+            w("Note: No relevant data was found in your database for this question.\n")
+            w("\n")
+
         # Add current question
-        prompt_parts.append("=== CURRENT QUESTION ===")
-        prompt_parts.append(question)
-        prompt_parts.append("")
-        prompt_parts.append("Please provide a helpful and accurate response based on the above information.")
-        
-        return "\n".join(prompt_parts)
+        w("=== CURRENT QUESTION ===\n")
+        w(question)
+        w("\n\nPlease provide a helpful and accurate response based on the above information.")
+
+        return buf.getvalue()
     
     async def generate_response(
         self,
@@ -115,20 +129,20 @@ Response guidelines:
     ) -> str:
         """Generate a response using Gemini."""
         try:
-            system_prompt = self._build_system_prompt()
             user_prompt = self._build_user_prompt(question, context_documents, chat_history)
-            
-            # Combine system and user prompts
-            full_prompt = f"{system_prompt}\n\n{user_prompt}"
-            
+
+            # Combine cached system prefix and user prompt
+            full_prompt = self._system_prefix + user_prompt
+
             # Generate response asynchronously
             def generate_sync():
                 response = self.model.generate_content(full_prompt)
                 return response.text
             
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, generate_sync)
-            
+            response = await asyncio.get_running_loop().run_in_executor(
+                _GEMINI_EXEC, generate_sync
+            )
+
             logger.info("Generated response using Gemini")
             return response.strip()
             
@@ -144,28 +158,48 @@ Response guidelines:
     ) -> AsyncIterator[str]:
         """Generate a streaming response using Gemini."""
         try:
-            system_prompt = self._build_system_prompt()
             user_prompt = self._build_user_prompt(question, context_documents, chat_history)
-            
-            # Combine system and user prompts
-            full_prompt = f"{system_prompt}\n\n{user_prompt}"
-            
-            # Generate streaming response
-            def generate_stream_sync():
-                response = self.model.generate_content(
-                    full_prompt,
-                    stream=True
-                )
-                return response
-            
-            loop = asyncio.get_event_loop()
-            stream_response = await loop.run_in_executor(None, generate_stream_sync)
-            
-            # Yield chunks asynchronously
-            for chunk in stream_response:
-                if chunk.text:
-                    yield chunk.text
-            
+
+            # Combine cached system prefix and user prompt
+            full_prompt = self._system_prefix + user_prompt
+
+            # Pump chunks from a worker thread through a queue: iterating the
+            # SDK's sync stream directly on the event loop would block it for
+            # every next() call
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue = asyncio.Queue(maxsize=32)
+
+            def deliver(item):
+                # Block the pump until the queue has room: put_nowait via
+                # call_soon_threadsafe would raise QueueFull inside the
+                # loop callback once the consumer lags maxsize behind,
+                # silently dropping chunks — or the terminator/exception,
+                # hanging the stream forever
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+            def pump():
+                try:
+                    stream_response = self.model.generate_content(
+                        full_prompt,
+                        stream=True
+                    )
+                    for chunk in stream_response:
+                        if chunk.text:
+                            deliver(chunk.text)
+                    deliver(None)
+                except Exception as e:  # Surface worker errors on the loop
+                    deliver(e)
+
+            _GEMINI_EXEC.submit(pump)
+
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+
             logger.info("Generated streaming response using Gemini")
             
         except Exception as e:
@@ -181,8 +215,9 @@ Response guidelines:
                 response = self.model.generate_content(test_prompt)
                 return response.text
             
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, test_sync)
+            response = await asyncio.get_running_loop().run_in_executor(
+                _GEMINI_EXEC, test_sync
+            )
             
             return bool(response and len(response.strip()) > 0)
             
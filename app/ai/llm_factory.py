@@ -7,6 +7,13 @@ from .custom_llm_client import create_custom_llm_client
 
 logger = logging.getLogger(__name__)
 
+# Providers served by create_custom_llm_client, plus their default models
+_CUSTOM_PROVIDERS = frozenset({"ollama", "lmstudio", "openai-compatible", "custom"})
+_DEFAULT_MODELS = {
+    "ollama": "llama2",
+    "lmstudio": "local-model",
+}
+
 class LLMFactory:
     """Factory for creating LLM clients based on configuration."""
     
@@ -35,23 +42,18 @@ class LLMFactory:
             ValueError: If required parameters are missing or provider is unsupported
         """
         provider = provider.lower()
-        
+
         if provider == "gemini":
             api_key = api_key or settings.GEMINI_API_KEY
             if not api_key:
                 raise ValueError("Gemini API key is required")
             return GeminiClient(api_key=api_key)
-        
-        elif provider in ["ollama", "lmstudio", "openai-compatible", "custom"]:
+
+        if provider in _CUSTOM_PROVIDERS:
+            model_name = model_name or _DEFAULT_MODELS.get(provider)
             if not model_name:
-                # Set default model names for different providers
-                if provider == "ollama":
-                    model_name = "llama2"
-                elif provider == "lmstudio":
-                    model_name = "local-model"
-                else:
-                    raise ValueError(f"model_name is required for {provider}")
-            
+                raise ValueError(f"model_name is required for {provider}")
+
             return create_custom_llm_client(
                 provider=provider,
                 model_name=model_name,
@@ -59,9 +61,8 @@ class LLMFactory:
                 api_key=api_key,
                 **kwargs
             )
-        
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+        raise ValueError(f"Unsupported LLM provider: {provider}")
     
     @staticmethod
     def create_from_config(config: Dict[str, Any]) -> BaseLLMClient:
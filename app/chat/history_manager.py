@@ -1,30 +1,64 @@
-from typing import List, Dict, Any
-import json
+from typing import Dict, List, Any, Optional
+from collections import deque
+import aiofiles
+import asyncio
+import functools
+import orjson
 import os
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=4096)
+def _history_file_path(history_dir: str, user_name: str) -> str:
+    """Resolve (and memoize) the sanitized history file path for a user."""
+    safe_name = "".join(c for c in user_name if c.isalnum() or c in ('-', '_'))
+    return os.path.join(history_dir, f"{safe_name}_history.jsonl")
+
 class ChatHistoryManager:
-    """Manages chat history for users."""
-    
+    """Manages chat history for users.
+
+    Histories are stored append-only as JSONL (one message per line) and
+    mirrored in a bounded in-memory deque per user, so adding a message is a
+    single appended line instead of a full decode/re-encode of the file.
+    """
+
+    # Keep only last N messages to prevent unlimited growth
+    MAX_MESSAGES = 100
+    # Rewrite the file from the in-memory deque every N appends so the
+    # on-disk log doesn't grow unbounded
+    COMPACT_EVERY = 100
+
     def __init__(self, history_dir: str = "./chat_history"):
         self.history_dir = history_dir
+        self._cache: Dict[str, deque] = {}
+        self._appends_since_compaction: Dict[str, int] = {}
         self._ensure_history_dir()
-    
+
     def _ensure_history_dir(self) -> None:
         """Ensure chat history directory exists."""
         if not os.path.exists(self.history_dir):
             os.makedirs(self.history_dir)
             logger.info(f"Created chat history directory: {self.history_dir}")
-    
+
     def _get_user_history_file(self, user_name: str) -> str:
         """Get the file path for a user's chat history."""
-        # Sanitize user_name for filename
-        safe_name = "".join(c for c in user_name if c.isalnum() or c in ('-', '_'))
-        return os.path.join(self.history_dir, f"{safe_name}_history.json")
-    
+        return _history_file_path(self.history_dir, user_name)
+
+    async def _get_cached_history(self, user_name: str) -> deque:
+        """Get the in-memory history deque, loading from disk on first use."""
+        cache = self._cache.get(user_name)
+        if cache is None:
+            history_file = self._get_user_history_file(user_name)
+            cache = deque(
+                await self._load_history(history_file),
+                maxlen=self.MAX_MESSAGES
+            )
+            self._cache[user_name] = cache
+        return cache
+
     async def add_message(
         self,
         user_name: str,
@@ -34,7 +68,7 @@ class ChatHistoryManager:
     ) -> None:
         """
         Add a message to user's chat history.
-        
+
         Args:
             user_name: User identifier
             role: Message role ('user' or 'assistant')
@@ -42,11 +76,9 @@ class ChatHistoryManager:
             metadata: Additional metadata (e.g., sources, timestamp)
         """
         try:
+            cache = await self._get_cached_history(user_name)
             history_file = self._get_user_history_file(user_name)
-            
-            # Load existing history
-            history = await self._load_history(history_file)
-            
+
             # Create new message
             message = {
                 "role": role,
@@ -54,23 +86,26 @@ class ChatHistoryManager:
                 "timestamp": datetime.now().isoformat(),
                 "metadata": metadata or {}
             }
-            
-            # Add to history
-            history.append(message)
-            
-            # Keep only last 100 messages to prevent unlimited growth
-            if len(history) > 100:
-                history = history[-100:]
-            
-            # Save updated history
-            await self._save_history(history_file, history)
-            
+
+            cache.append(message)
+
+            # Append one line instead of rewriting the whole history
+            async with aiofiles.open(history_file, 'ab') as f:
+                await f.write(orjson.dumps(message) + b"\n")
+
+            # Periodically compact the log down to the retained window
+            appends = self._appends_since_compaction.get(user_name, 0) + 1
+            if appends >= self.COMPACT_EVERY:
+                await self._save_history(history_file, list(cache))
+                appends = 0
+            self._appends_since_compaction[user_name] = appends
+
             logger.debug(f"Added {role} message to history for user: {user_name}")
-            
+
         except Exception as e:
             logger.error(f"Error adding message to chat history: {e}")
             # Don't raise exception as chat history is not critical
-    
+
     async def get_history(
         self,
         user_name: str,
@@ -78,54 +113,94 @@ class ChatHistoryManager:
     ) -> List[Dict[str, Any]]:
         """
         Get chat history for a user.
-        
+
         Args:
             user_name: User identifier
             limit: Maximum number of messages to return
-            
+
         Returns:
             List of chat messages
         """
         try:
-            history_file = self._get_user_history_file(user_name)
-            history = await self._load_history(history_file)
-            
+            cache = await self._get_cached_history(user_name)
+
             # Return last N messages
-            return history[-limit:] if history else []
-            
+            if not cache:
+                return []
+            history = list(cache)
+            return history[-limit:]
+
         except Exception as e:
             logger.error(f"Error getting chat history: {e}")
             return []
-    
+
     async def clear_history(self, user_name: str) -> None:
         """Clear chat history for a user."""
         try:
+            self._cache.pop(user_name, None)
+            self._appends_since_compaction.pop(user_name, None)
+
             history_file = self._get_user_history_file(user_name)
-            if os.path.exists(history_file):
-                os.remove(history_file)
+            if await asyncio.to_thread(os.path.exists, history_file):
+                await asyncio.to_thread(os.remove, history_file)
                 logger.info(f"Cleared chat history for user: {user_name}")
-            
+
         except Exception as e:
             logger.error(f"Error clearing chat history: {e}")
             raise
-    
+
     async def _load_history(self, history_file: str) -> List[Dict[str, Any]]:
-        """Load chat history from file."""
-        if not os.path.exists(history_file):
-            return []
-        
+        """Load chat history from a JSONL file."""
+        if not await asyncio.to_thread(os.path.exists, history_file):
+            return await self._migrate_legacy_history(history_file)
+
         try:
-            with open(history_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            async with aiofiles.open(history_file, 'rb') as f:
+                lines = await f.readlines()
+
+            # Only the retained tail of the log matters
+            messages = []
+            for line in lines[-self.MAX_MESSAGES:]:
+                line = line.strip()
+                if line:
+                    messages.append(orjson.loads(line))
+            return messages
+        except (orjson.JSONDecodeError, FileNotFoundError):
             logger.warning(f"Could not load history file: {history_file}")
             return []
-    
+
+    async def _migrate_legacy_history(self, history_file: str) -> List[Dict[str, Any]]:
+        """One-time migration of a pre-JSONL history file.
+
+        Histories written before the append-only format lived in
+        *_history.json as a single JSON array; without this, upgrading
+        would silently orphan every deployed user's history. The legacy
+        file is rewritten as JSONL and removed so the fallback only ever
+        runs once per user.
+        """
+        legacy_file = history_file[:-1] if history_file.endswith(".jsonl") else None
+        if legacy_file is None or not await asyncio.to_thread(os.path.exists, legacy_file):
+            return []
+
+        try:
+            async with aiofiles.open(legacy_file, 'rb') as f:
+                messages = orjson.loads(await f.read())
+            if not isinstance(messages, list):
+                raise ValueError("legacy history is not a list")
+            messages = messages[-self.MAX_MESSAGES:]
+            await self._save_history(history_file, messages)
+            await asyncio.to_thread(os.remove, legacy_file)
+            logger.info(f"Migrated legacy history file: {legacy_file}")
+            return messages
+        except (orjson.JSONDecodeError, ValueError, OSError) as e:
+            logger.warning(f"Could not migrate legacy history file {legacy_file}: {e}")
+            return []
+
     async def _save_history(
         self,
         history_file: str,
         history: List[Dict[str, Any]]
     ) -> None:
-        """Save chat history to file."""
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
+        """Rewrite the history file from the retained messages (compaction)."""
+        async with aiofiles.open(history_file, 'wb') as f:
+            await f.write(b"".join(orjson.dumps(message) + b"\n" for message in history))
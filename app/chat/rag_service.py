@@ -1,9 +1,16 @@
-from typing import List, Dict, Any, AsyncIterator
+from typing import List, Dict, Any, AsyncIterator, Optional
+import asyncio
 import logging
+from collections import OrderedDict
 from datetime import datetime
 
-from ..models import ChatRequest, ChatResponse, DataSourceConfig, StreamChunk, DatabaseType
-from ..database.factory import DatabaseFactory
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ..config import settings
+from ..models import ChatRequest, ChatResponse, DataSourceConfig, Source, StreamChunk, DatabaseType
+from ..database.factory import db_factory
 from ..database.csv_connector import CSVConnector
 from ..embeddings.manager import EmbeddingManager
 from ..ai.gemini_client import GeminiClient
@@ -13,7 +20,10 @@ logger = logging.getLogger(__name__)
 
 class RAGService:
     """Main service orchestrating the RAG pipeline."""
-    
+
+    # Maximum number of query embeddings retained in the LRU cache
+    QUERY_EMBED_CACHE_SIZE = 1024
+
     def __init__(
         self,
         embedding_manager: EmbeddingManager,
@@ -23,6 +33,115 @@ class RAGService:
         self.embedding_manager = embedding_manager
         self.gemini_client = gemini_client
         self.history_manager = history_manager
+        # LRU cache of query embeddings so repeated questions skip the
+        # embedding model and only pay the vector search
+        self._query_embed_cache: OrderedDict = OrderedDict()
+        self._query_cache_lock = asyncio.Lock()
+        # Semantic cache: past query embeddings (rows, L2-normalized then
+        # scalar-quantized to int8) mapped to their retrieval results, so
+        # near-duplicate questions skip the vector DB entirely. Int8 keys
+        # are 4x smaller than fp32 and score via integer dot products
+        self._proximity_keys: Optional[np.ndarray] = None
+        self._proximity_values: List[List[Dict[str, Any]]] = []
+        self._proximity_lock = asyncio.Lock()
+        # Strong references to fire-and-forget persistence tasks; discarded
+        # on completion so the set stays small
+        self._bg_tasks: set = set()
+
+    def _spawn_bg_task(self, coro) -> None:
+        """Run a coroutine in the background, logging any failure."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+
+        def _on_done(t: asyncio.Task) -> None:
+            self._bg_tasks.discard(t)
+            if not t.cancelled() and t.exception() is not None:
+                logger.error(f"Background task failed: {t.exception()}")
+
+        task.add_done_callback(_on_done)
+
+    async def _embed_query_cached(self, message: str) -> List[float]:
+        """Embed a query, reusing a cached vector for repeated messages."""
+        async with self._query_cache_lock:
+            vector = self._query_embed_cache.get(message)
+            if vector is not None:
+                self._query_embed_cache.move_to_end(message)
+                return vector
+
+        vector = await self.embedding_manager.embed_query(message)
+
+        async with self._query_cache_lock:
+            self._query_embed_cache[message] = vector
+            self._query_embed_cache.move_to_end(message)
+            if len(self._query_embed_cache) > self.QUERY_EMBED_CACHE_SIZE:
+                self._query_embed_cache.popitem(last=False)
+        return vector
+
+    @staticmethod
+    def _build_sources(
+        context_documents: List[Dict[str, Any]],
+        context_metadatas: List[Dict[str, Any]]
+    ) -> List[Source]:
+        """Build response Source entries with one distance lookup per doc."""
+        sources = []
+        for i, doc in enumerate(context_documents):
+            dist = doc.get("distance")
+            sources.append(Source(
+                content=doc.get("content", ""),
+                metadata=context_metadatas[i],
+                relevance_score=(1 - dist) if dist is not None else None
+            ))
+        return sources
+
+    @staticmethod
+    def _quantize_embedding(normalized: np.ndarray) -> np.ndarray:
+        """Scalar-quantize an L2-normalized embedding to int8."""
+        return np.clip(np.rint(normalized * 127.0), -127, 127).astype(np.int8)
+
+    async def _search_with_semantic_cache(
+        self,
+        query_embedding: List[float],
+        n_results: int
+    ) -> List[Dict[str, Any]]:
+        """Retrieve context, reusing results cached for near-duplicate queries.
+
+        Cosine similarity against cached query embeddings is a single BLAS
+        matrix-vector product; a hit above SEMANTIC_CACHE_THRESHOLD returns
+        the cached result list without touching the vector DB.
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm > 0.0:
+            query = query / norm
+        query_q = self._quantize_embedding(query)
+
+        async with self._proximity_lock:
+            if self._proximity_keys is not None and len(self._proximity_values) > 0:
+                # Approximate cosine: int8 dot product rescaled by 127^2
+                scores = (self._proximity_keys @ query_q.astype(np.int32)) * (1.0 / 127.0 ** 2)
+                best = int(np.argmax(scores))
+                if float(scores[best]) >= settings.SEMANTIC_CACHE_THRESHOLD:
+                    logger.debug("Semantic cache hit for query")
+                    return self._proximity_values[best]
+
+        context_documents = await self.embedding_manager.search_by_vector(
+            query_embedding,
+            n_results=n_results
+        )
+
+        async with self._proximity_lock:
+            if self._proximity_keys is None:
+                self._proximity_keys = query_q[np.newaxis, :]
+            else:
+                self._proximity_keys = np.vstack([self._proximity_keys, query_q])
+            self._proximity_values.append(context_documents)
+
+            # FIFO eviction at capacity
+            if len(self._proximity_values) > settings.SEMANTIC_CACHE_SIZE:
+                self._proximity_keys = self._proximity_keys[1:]
+                self._proximity_values.pop(0)
+
+        return context_documents
     
     async def ingest_data_background(self, config: DataSourceConfig) -> None:
         """
@@ -35,7 +154,6 @@ class RAGService:
             logger.info(f"Starting data ingestion for {config.db_type} table/collection: {config.table_or_collection}")
             
             # Create database connector
-            db_factory = DatabaseFactory()
             db_connector = await db_factory.create_connector(
                 config.db_type,
                 config.connection_params
@@ -47,46 +165,76 @@ class RAGService:
             else:
                 await self._ingest_database_data(db_connector, config)
             
-            # Cleanup database connection
-            await db_connector.disconnect()
-            
+            # Connector stays open in the factory pool for the next ingest;
+            # idle connections are closed by the factory itself
+
         except Exception as e:
             logger.error(f"Error in background data ingestion: {e}")
             raise
     
+    async def _pipelined_add_documents(self, batches) -> None:
+        """Embed (documents, metadatas) batches through a small queue.
+
+        A producer task keeps collecting the next batch from the connector
+        while the current one runs through the embedding model, so DB I/O
+        and model compute overlap instead of alternating.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        async def produce():
+            try:
+                async for batch in batches:
+                    await queue.put(batch)
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            documents, metadatas = batch
+            await self.embedding_manager.add_documents(documents, metadatas)
+        await producer
+
     async def _ingest_csv_data(self, db_connector: CSVConnector, config: DataSourceConfig) -> None:
         """
         Ingest data from CSV file.
-        
+
         Args:
             db_connector: CSV database connector
             config: Data source configuration
         """
         count = 0
-        documents = []
-        metadatas = []
-        
-        # Process CSV data in chunks for memory efficiency
-        async for chunk in db_connector.fetch_in_chunks():
-            for record in chunk:
-                # Get text content for embedding
-                text_content = db_connector.get_text_content(record)
-                if text_content.strip():  # Only process non-empty text
-                    documents.append(text_content)
-                    metadatas.append(db_connector.get_metadata(record))
-                    count += 1
-                    
-                    # Process in batches to avoid memory issues
-                    if len(documents) >= 100:
-                        await self.embedding_manager.add_documents(documents, metadatas)
-                        documents = []
-                        metadatas = []
-                        logger.info(f"Processed {count} CSV records so far...")
-        
-        # Process remaining documents
-        if documents:
-            await self.embedding_manager.add_documents(documents, metadatas)
-        
+
+        async def batches():
+            nonlocal count
+            documents = []
+            metadatas = []
+
+            # Process CSV data in chunks for memory efficiency
+            async for chunk in db_connector.fetch_in_chunks():
+                for record in chunk:
+                    # Get text content for embedding
+                    text_content = db_connector.get_text_content(record)
+                    if text_content.strip():  # Only process non-empty text
+                        documents.append(text_content)
+                        metadatas.append(db_connector.get_metadata(record))
+                        count += 1
+
+                        # Process in batches to avoid memory issues
+                        if len(documents) >= settings.EMBEDDING_BATCH_SIZE:
+                            yield documents, metadatas
+                            documents = []
+                            metadatas = []
+                            logger.info(f"Processed {count} CSV records so far...")
+
+            # Process remaining documents
+            if documents:
+                yield documents, metadatas
+
+        await self._pipelined_add_documents(batches())
+
         logger.info(f"CSV data ingestion completed. Total records processed: {count}")
     
     async def _ingest_database_data(self, db_connector, config: DataSourceConfig) -> None:
@@ -97,44 +245,59 @@ class RAGService:
             db_connector: Database connector
             config: Data source configuration
         """
-        # Fetch data from database
-        records = await db_connector.fetch_data(
-            config.table_or_collection,
-            config.columns_or_fields
-        )
-        
-        documents = []
-        metadatas = []
         count = 0
-        
-        for record in records:
-            # Combine text fields
-            text_parts = []
-            for field in config.text_fields:
-                if field in record and record[field]:
-                    text_parts.append(str(record[field]))
-            
-            text_content = " ".join(text_parts)
-            if text_content.strip():
-                documents.append(text_content)
-                metadatas.append({
-                    "source": config.db_type,
-                    "table": config.table_or_collection,
-                    **{k: v for k, v in record.items() if k not in config.text_fields}
-                })
-                count += 1
-                
-                # Process in batches
-                if len(documents) >= 100:
-                    await self.embedding_manager.add_documents(documents, metadatas)
-                    documents = []
-                    metadatas = []
+
+        # Hoist loop invariants: set membership for text-field exclusion and
+        # the constant metadata keys shared by every record
+        text_fields = config.text_fields
+        text_fields_set = frozenset(text_fields)
+        base_meta = {
+            "source": config.db_type,
+            "table": config.table_or_collection
+        }
+
+        def build_batch(records):
+            # Join text fields for the whole batch in one vectorized Arrow
+            # kernel instead of a Python loop per record; empty/missing
+            # fields become nulls which the join skips
+            nonlocal count
+            columns = [
+                pa.array(
+                    [str(v) if (v := record.get(field)) else None for record in records],
+                    type=pa.string()
+                )
+                for field in text_fields
+            ]
+            texts = pc.binary_join_element_wise(*columns, " ", null_handling="skip")
+
+            documents = []
+            metadatas = []
+            for record, text_content in zip(records, texts.to_pylist()):
+                if text_content and text_content.strip():
+                    documents.append(text_content)
+                    metadatas.append({
+                        **base_meta,
+                        **{k: v for k, v in record.items() if k not in text_fields_set}
+                    })
+                    count += 1
+            return documents, metadatas
+
+        async def batches():
+            # The connector yields ready-made record batches, so embedding
+            # starts immediately and memory stays bounded by the batch
+            # size, not the table size
+            async for records in db_connector.get_data(
+                config.table_or_collection,
+                config.columns_or_fields,
+                batch_size=settings.EMBEDDING_BATCH_SIZE
+            ):
+                documents, metadatas = build_batch(records)
+                if documents:
+                    yield documents, metadatas
                     logger.info(f"Processed {count} database records so far...")
-        
-        # Process remaining documents
-        if documents:
-            await self.embedding_manager.add_documents(documents, metadatas)
-            
+
+        await self._pipelined_add_documents(batches())
+
         logger.info(f"Database data ingestion completed. Total records processed: {count}")
     
     async def process_chat_request(self, request: ChatRequest) -> ChatResponse:
@@ -148,48 +311,59 @@ class RAGService:
             Chat response with AI-generated answer
         """
         try:
-            # Get chat history if requested
-            chat_history = []
-            if request.include_history:
-                chat_history = await self.history_manager.get_history(request.user_name)
-            
-            # Search for relevant context
-            context_documents = await self.embedding_manager.search_similar(
-                request.message,
+            # Fetch history concurrently with the retrieval pipeline; the
+            # two are independent I/O paths
+            history_task = (
+                asyncio.create_task(self.history_manager.get_history(request.user_name))
+                if request.include_history else None
+            )
+
+            # Search for relevant context (cached query embedding)
+            query_embedding = await self._embed_query_cached(request.message)
+            context_documents = await self._search_with_semantic_cache(
+                query_embedding,
                 n_results=request.max_results
             )
-            
+
+            chat_history = await history_task if history_task else []
+
+            # Nothing retrieved and nothing to go on: skip the LLM call,
+            # the most expensive step in the pipeline
+            if not context_documents and not chat_history:
+                return ChatResponse(
+                    user_name=request.user_name,
+                    response=settings.NO_CONTEXT_RESPONSE,
+                    sources=[],
+                    timestamp=datetime.now()
+                )
+
+            # Extract metadata once; it is needed both for the response
+            # sources and the persisted history entry
+            context_metadatas = [doc.get("metadata", {}) for doc in context_documents]
+
             # Generate AI response
             ai_response = await self.gemini_client.generate_response(
                 request.message,
                 context_documents,
                 chat_history
             )
-            
-            # Save user message to history
-            await self.history_manager.add_message(
+
+            # Persist both messages in the background; the response should
+            # not wait on history writes
+            self._spawn_bg_task(self.history_manager.add_message(
                 request.user_name,
                 "user",
                 request.message
-            )
-            
-            # Save AI response to history
-            await self.history_manager.add_message(
+            ))
+            self._spawn_bg_task(self.history_manager.add_message(
                 request.user_name,
                 "assistant",
                 ai_response,
-                {"sources": [doc.get("metadata", {}) for doc in context_documents]}
-            )
-            
+                {"sources": context_metadatas}
+            ))
+
             # Format sources for response
-            sources = []
-            for doc in context_documents:
-                source = {
-                    "content": doc.get("content", ""),
-                    "metadata": doc.get("metadata", {}),
-                    "relevance_score": 1 - doc.get("distance", 0) if doc.get("distance") is not None else None
-                }
-                sources.append(source)
+            sources = self._build_sources(context_documents, context_metadatas)
             
             return ChatResponse(
                 user_name=request.user_name,
@@ -216,58 +390,71 @@ class RAGService:
             Stream chunks with response content
         """
         try:
-            # Get chat history if requested
-            chat_history = []
-            if request.include_history:
-                chat_history = await self.history_manager.get_history(request.user_name)
-            
-            # Search for relevant context
-            context_documents = await self.embedding_manager.search_similar(
-                request.message,
+            # Fetch history concurrently with the retrieval pipeline; the
+            # two are independent I/O paths
+            history_task = (
+                asyncio.create_task(self.history_manager.get_history(request.user_name))
+                if request.include_history else None
+            )
+
+            # Search for relevant context (cached query embedding)
+            query_embedding = await self._embed_query_cached(request.message)
+            context_documents = await self._search_with_semantic_cache(
+                query_embedding,
                 n_results=request.max_results
             )
-            
+
+            chat_history = await history_task if history_task else []
+
+            # Nothing retrieved and nothing to go on: skip the LLM call,
+            # the most expensive step in the pipeline
+            if not context_documents and not chat_history:
+                yield {"type": "sources", "sources": []}
+                yield {"type": "content", "content": settings.NO_CONTEXT_RESPONSE}
+                yield {"type": "done", "user_name": request.user_name}
+                return
+
+            # Extract metadata once; it is needed both for the sources frame
+            # and the persisted history entry
+            context_metadatas = [doc.get("metadata", {}) for doc in context_documents]
+
             # Yield sources first
-            sources = []
-            for doc in context_documents:
-                source = {
-                    "content": doc.get("content", ""),
-                    "metadata": doc.get("metadata", {}),
-                    "relevance_score": 1 - doc.get("distance", 0) if doc.get("distance") is not None else None
-                }
-                sources.append(source)
+            sources = self._build_sources(context_documents, context_metadatas)
             
             yield {
                 "type": "sources",
                 "sources": sources
             }
             
-            # Generate and stream AI response
-            full_response = ""
+            # Generate and stream AI response. The content frame is allocated
+            # once and mutated per chunk; the consumer serializes each yield
+            # immediately, so reuse is safe and avoids a dict per token
+            content_frame = {"type": "content", "content": None}
+            response_parts: List[str] = []
             async for chunk in self.gemini_client.generate_response_stream(
                 request.message,
                 context_documents,
                 chat_history
             ):
-                full_response += chunk
-                yield {
-                    "type": "content",
-                    "content": chunk
-                }
-            
-            # Save to history after streaming is complete
-            await self.history_manager.add_message(
+                response_parts.append(chunk)
+                content_frame["content"] = chunk
+                yield content_frame
+
+            # Join once; repeated += would be quadratic on long responses
+            full_response = "".join(response_parts)
+
+            # Persist in the background after streaming is complete
+            self._spawn_bg_task(self.history_manager.add_message(
                 request.user_name,
                 "user",
                 request.message
-            )
-            
-            await self.history_manager.add_message(
+            ))
+            self._spawn_bg_task(self.history_manager.add_message(
                 request.user_name,
                 "assistant",
                 full_response,
-                {"sources": [doc.get("metadata", {}) for doc in context_documents]}
-            )
+                {"sources": context_metadatas}
+            ))
             
             # Final done signal
             yield {
@@ -1,15 +1,39 @@
 """
 Configuration module for Plug-and-Play RAG system
+
+The environment-driven Settings live in .settings and are re-exported
+here so `from app.config import settings` resolves to one canonical
+instance. The YAML config-driven entry points (ConfigManager,
+ConfigDrivenApp, ...) are loaded lazily so importing settings does not
+drag in the optional config-driven stack.
 """
 
-from .manager import ConfigManager, PlugAndPlayConfig, get_config
-from .app import ConfigDrivenApp, get_app, initialize_app
+from .settings import Settings, get_settings, settings
 
 __all__ = [
+    "Settings",
+    "get_settings",
+    "settings",
     "ConfigManager",
-    "PlugAndPlayConfig", 
+    "PlugAndPlayConfig",
     "get_config",
     "ConfigDrivenApp",
     "get_app",
     "initialize_app"
 ]
+
+_LAZY_EXPORTS = {
+    "ConfigManager": "manager",
+    "PlugAndPlayConfig": "manager",
+    "get_config": "manager",
+    "ConfigDrivenApp": "app",
+    "get_app": "app",
+    "initialize_app": "app",
+}
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(f".{module_name}", __name__), name)
@@ -3,19 +3,21 @@ Configuration-driven application initialization
 """
 
 import asyncio
+import atexit
 import logging
+import os
+import signal
+from contextvars import ContextVar
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from app.config.manager import get_config, PlugAndPlayConfig
-from app.database.factory import DatabaseFactory
-from app.database.csv_connector import CSVConnector
+from app.config.manager import get_config, snapshot_config, PlugAndPlayConfig
 from app.models import DataSourceConfig, DatabaseType, CSVConfig
-from app.chat.rag_service import RAGService
-from app.embeddings.manager import EmbeddingManager
-from app.ai.gemini_client import GeminiClient
-from app.ai.multi_llm_client import MultiLLMClient
-from app.chat.history_manager import ChatHistoryManager
+
+# The service stack (RAGService, EmbeddingManager, LLM clients, ...) is
+# imported inside the _initialize_* methods: those modules pull in
+# sentence-transformers, chromadb and google-generativeai, which callers
+# that only want configuration handling should not pay for.
 
 
 logger = logging.getLogger(__name__)
@@ -27,54 +29,119 @@ class ConfigDrivenApp:
     def __init__(self, config_path: str = None):
         """Initialize with optional custom config path."""
         self.config: PlugAndPlayConfig = None
-        self.rag_service: RAGService = None
-        self.embedding_manager: EmbeddingManager = None
+        self.rag_service = None
+        self.embedding_manager = None
         self.llm_client = None
-        self.history_manager: ChatHistoryManager = None
-        
+        self.history_manager = None
+        self._shutdown_done = False
+        # model_dump() of CSV connection params, keyed by column schema so
+        # many files sharing one schema dump it once
+        self._csv_param_templates: Dict[tuple, Dict[str, Any]] = {}
+        # Resolved once; overridable so deployments outside Docker don't
+        # inherit the container path
+        self._data_dir = Path(os.environ.get("RAG_DATA_DIR", "/app/data")).resolve()
+
+
         if config_path:
             from app.config.manager import ConfigManager
             manager = ConfigManager(config_path)
             self.config = manager.load_config()
         else:
             self.config = get_config()
+
+        # Frozen slotted view of the sections the initializers and
+        # request handlers read repeatedly
+        self.config_snapshot = snapshot_config(self.config)
     
     async def initialize_services(self):
         """Initialize all services based on configuration."""
         logger.info("Initializing services from configuration...")
         
-        # 1. Initialize embedding manager
-        await self._initialize_embedding_manager()
-        
-        # 2. Initialize LLM client
-        await self._initialize_llm_client()
-        
-        # 3. Initialize chat history manager
-        await self._initialize_history_manager()
-        
-        # 4. Initialize RAG service
+        # 1-3. Embedding manager, LLM client and history manager are
+        # independent of each other, so their I/O (model load, API
+        # handshake, chroma open) overlaps; startup cost becomes the max
+        # of the three rather than the sum
+        await asyncio.gather(
+            self._initialize_embedding_manager(),
+            self._initialize_llm_client(),
+            self._initialize_history_manager(),
+        )
+
+        # 4. RAG service reads the attributes the three above set, so it
+        # stays outside the gather
         await self._initialize_rag_service()
         
         # 5. Auto-ingest data if configured
         if self.config.auto_ingest_on_startup:
             await self._auto_ingest_data()
-        
+
+        self._register_shutdown_hooks()
+
         logger.info("All services initialized successfully")
+
+    def _register_shutdown_hooks(self):
+        """Flush services even when the process exits outside the lifespan.
+
+        A SIGTERM (k8s rolling restart) or plain interpreter exit that
+        bypasses Uvicorn's lifespan would otherwise drop in-flight
+        embedding work. The SIGTERM handler chains to whatever was
+        installed before it (e.g. Uvicorn's own), so graceful server
+        shutdown still happens; shutdown() itself is idempotent, so the
+        lifespan, signal and atexit paths can all fire.
+        """
+        atexit.register(self._shutdown_sync)
+
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def _on_sigterm(signum, frame):
+            self._shutdown_sync()
+            if callable(previous):
+                previous(signum, frame)
+            elif previous == signal.SIG_DFL:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        try:
+            signal.signal(signal.SIGTERM, _on_sigterm)
+        except ValueError:
+            # Signals can only be installed from the main thread
+            pass
+
+    def _shutdown_sync(self):
+        """Run shutdown() from synchronous exit paths (signal/atexit)."""
+        if self._shutdown_done:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.shutdown())
+        else:
+            loop.create_task(self.shutdown())
     
     async def _initialize_embedding_manager(self):
         """Initialize embedding manager from config."""
-        config = self.config.embedding
-        
+        from app.embeddings.manager import EmbeddingManager
+
+        config = self.config_snapshot.embedding
+
+        # Thread sizing lives with the embedding code so both the
+        # config-driven and settings-driven startup paths share it
+        from app.embeddings.manager import pin_torch_threads
+        pin_torch_threads()
+
         logger.info(f"Initializing embedding manager with model: {config.model_name}")
         self.embedding_manager = EmbeddingManager(
             model_name=config.model_name,
-            collection_name=self.config.vector_db.collection_name,
-            persist_directory=self.config.vector_db.persist_directory
+            collection_name=self.config_snapshot.vector_db.collection_name,
+            persist_directory=self.config_snapshot.vector_db.persist_directory
         )
         await self.embedding_manager.initialize()
     
     async def _initialize_llm_client(self):
         """Initialize LLM client based on provider configuration."""
+        from app.ai.gemini_client import GeminiClient
+        from app.ai.multi_llm_client import MultiLLMClient
+
         llm_config = self.config.llm
         
         logger.info(f"Initializing LLM client: {llm_config.provider}")
@@ -101,6 +168,8 @@ class ConfigDrivenApp:
     async def _initialize_history_manager(self):
         """Initialize chat history manager."""
         if self.config.enable_chat_history:
+            from app.chat.history_manager import ChatHistoryManager
+
             logger.info("Initializing chat history manager")
             self.history_manager = ChatHistoryManager()
         else:
@@ -109,6 +178,8 @@ class ConfigDrivenApp:
     
     async def _initialize_rag_service(self):
         """Initialize RAG service with all components."""
+        from app.chat.rag_service import RAGService
+
         logger.info("Initializing RAG service")
         self.rag_service = RAGService(
             embedding_manager=self.embedding_manager,
@@ -119,48 +190,92 @@ class ConfigDrivenApp:
     async def _auto_ingest_data(self):
         """Auto-ingest data sources configured for startup."""
         logger.info("Starting auto-ingestion of configured data sources...")
-        
+
+        self._validate_csv_sources()
+
+        # Cap in-flight sources so they don't all thrash the embedding
+        # model and vector DB at once; each source still streams its own
+        # rows in batches through the shared embedding manager
+        semaphore = asyncio.Semaphore(max(self.config.embedding.batch_size // 8, 4))
+
+        async def run_bounded(coro):
+            async with semaphore:
+                return await coro
+
         ingestion_tasks = []
-        
+
         # Process CSV sources
         if self.config.csv_sources:
             for csv_source in self.config.csv_sources:
-                task = self._ingest_csv_source(csv_source)
+                task = run_bounded(self._ingest_csv_source(csv_source))
                 ingestion_tasks.append(task)
-        
+
         # Process database sources
         if self.config.database_sources:
             for db_source in self.config.database_sources:
-                task = self._ingest_database_source(db_source)
+                task = run_bounded(self._ingest_database_source(db_source))
                 ingestion_tasks.append(task)
         
-        # Run all ingestion tasks
+        # Run all ingestion tasks, logging each result as it finishes
+        # instead of holding feedback until the slowest source is done
         if ingestion_tasks:
-            results = await asyncio.gather(*ingestion_tasks, return_exceptions=True)
-            
-            # Log results
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(f"Ingestion task {i} failed: {result}")
-                else:
-                    logger.info(f"Ingestion task {i} completed successfully")
+            for completed in asyncio.as_completed(ingestion_tasks):
+                try:
+                    await completed
+                    logger.info("Ingestion task completed successfully")
+                except Exception as e:
+                    logger.error(f"Ingestion task failed: {e}")
         
         logger.info("Auto-ingestion completed")
     
-    async def _ingest_csv_source(self, csv_config):
-        """Ingest a single CSV data source."""
+    def _validate_csv_sources(self) -> None:
+        """Fail fast on missing CSV files with one directory scan.
+
+        A single scandir replaces a stat syscall per source, which also
+        avoids per-file latency spikes on cold NFS/Docker volumes.
+        """
+        if not self.config.csv_sources:
+            return
+
         try:
-            logger.info(f"Ingesting CSV source: {csv_config.name}")
-            
-            # Resolve file path relative to data directory
-            data_dir = Path("/app/data")  # Docker container path
-            file_path = data_dir / csv_config.file_path
-            
-            if not file_path.exists():
-                raise FileNotFoundError(f"CSV file not found: {file_path}")
-            
-            # Create CSV configuration
-            csv_config_obj = CSVConfig(
+            with os.scandir(self._data_dir) as entries:
+                names = {entry.name for entry in entries}
+        except OSError as e:
+            raise FileNotFoundError(f"Data directory not accessible: {self._data_dir}") from e
+
+        missing = [
+            src.file_path for src in self.config.csv_sources
+            if src.file_path not in names and not (self._data_dir / src.file_path).exists()
+        ]
+        if missing:
+            raise FileNotFoundError(f"CSV files not found in {self._data_dir}: {missing}")
+
+    def _csv_connection_params(self, csv_config, file_path: Path) -> Dict[str, Any]:
+        """Build CSV connection params, reusing the dump per column schema.
+
+        Configs commonly list many files with the same columns; the
+        pydantic model_dump is paid once per distinct schema and each file
+        just overrides file_path on a shallow copy. The connector
+        re-validates the dict into its own CSVConfig, so sharing the
+        nested column dicts is safe.
+        """
+        key = (
+            csv_config.delimiter,
+            csv_config.has_header,
+            csv_config.encoding,
+            tuple(
+                (col.name, col.type, col.required, col.default_value, col.description)
+                for col in csv_config.columns
+            ),
+            tuple(csv_config.text_columns),
+            tuple(csv_config.metadata_columns) if csv_config.metadata_columns else None,
+            csv_config.chunk_size,
+            csv_config.skip_rows,
+            csv_config.max_rows,
+        )
+        template = self._csv_param_templates.get(key)
+        if template is None:
+            template = CSVConfig(
                 file_path=str(file_path),
                 delimiter=csv_config.delimiter,
                 has_header=csv_config.has_header,
@@ -171,12 +286,26 @@ class ConfigDrivenApp:
                 chunk_size=csv_config.chunk_size,
                 skip_rows=csv_config.skip_rows,
                 max_rows=csv_config.max_rows
-            )
-            
+            ).model_dump()
+            self._csv_param_templates[key] = template
+
+        params = template.copy()
+        params["file_path"] = str(file_path)
+        return params
+
+    async def _ingest_csv_source(self, csv_config):
+        """Ingest a single CSV data source."""
+        try:
+            logger.info(f"Ingesting CSV source: {csv_config.name}")
+
+            # Resolve file path relative to data directory (validated
+            # up-front in _validate_csv_sources)
+            file_path = self._data_dir / csv_config.file_path
+
             # Create data source config
             data_source_config = DataSourceConfig(
                 db_type=DatabaseType.CSV,
-                connection_params=csv_config_obj.model_dump(),
+                connection_params=self._csv_connection_params(csv_config, file_path),
                 table_or_collection="csv_data",
                 columns_or_fields=csv_config.text_columns,
                 text_fields=csv_config.text_columns
@@ -229,7 +358,7 @@ class ConfigDrivenApp:
             logger.error(f"Failed to ingest database source {db_source.name}: {e}")
             raise
     
-    def get_rag_service(self) -> RAGService:
+    def get_rag_service(self) -> "RAGService":
         """Get the initialized RAG service."""
         if not self.rag_service:
             raise RuntimeError("RAG service not initialized. Call initialize_services() first.")
@@ -240,7 +369,11 @@ class ConfigDrivenApp:
         return self.config
     
     async def shutdown(self):
-        """Shutdown all services gracefully."""
+        """Shutdown all services gracefully. Safe to call more than once."""
+        if self._shutdown_done:
+            return
+        self._shutdown_done = True
+
         logger.info("Shutting down services...")
         
         if self.embedding_manager:
@@ -253,21 +386,26 @@ class ConfigDrivenApp:
         logger.info("All services shut down successfully")
 
 
-# Global app instance
-app_instance: ConfigDrivenApp = None
+# Per-context app instance. A ContextVar instead of a module global means
+# concurrent initializations (parallel test workers, multi-tenant embedding
+# of the app) each see their own instance instead of racing on one slot.
+app_instance_var: ContextVar[Optional[ConfigDrivenApp]] = ContextVar(
+    "app_instance", default=None
+)
 
 
 def get_app() -> ConfigDrivenApp:
-    """Get the global app instance."""
-    global app_instance
-    if app_instance is None:
-        app_instance = ConfigDrivenApp()
-    return app_instance
+    """Get the app instance for the current context, creating it lazily."""
+    instance = app_instance_var.get()
+    if instance is None:
+        instance = ConfigDrivenApp()
+        app_instance_var.set(instance)
+    return instance
 
 
 async def initialize_app(config_path: str = None) -> ConfigDrivenApp:
     """Initialize the application with configuration."""
-    global app_instance
-    app_instance = ConfigDrivenApp(config_path)
-    await app_instance.initialize_services()
-    return app_instance
+    instance = ConfigDrivenApp(config_path)
+    app_instance_var.set(instance)
+    await instance.initialize_services()
+    return instance
@@ -2,14 +2,31 @@
 Configuration management for Plug-and-Play RAG system
 """
 
+import hashlib
+import logging
 import os
+import re
+import orjson
 import yaml
 import json
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, model_validator
 from app.models import DatabaseType, CSVColumnConfig, CSVColumnType
 
+# libyaml's C loader/dumper parse ~5-10x faster than the pure-Python
+# ones; fall back when PyYAML was built without it
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# ${VAR} placeholders in config values
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+_ENV_VAR_RE_BYTES = re.compile(rb'\$\{([^}]+)\}')
+
 
 class LLMConfig(BaseModel):
     """LLM provider configuration."""
@@ -38,14 +55,23 @@ class DatabaseConfig(BaseModel):
     # Additional connection parameters
     connection_params: Optional[Dict[str, Any]] = Field(None, description="Additional connection parameters")
     
-    @validator('host', 'port', 'database', 'username', 'password')
-    def validate_db_params(cls, v, values, field):
-        """Validate required database parameters based on type."""
-        db_type = values.get('type')
-        if db_type in [DatabaseType.POSTGRESQL, DatabaseType.MONGODB] and v is None:
-            if field.name != 'password':  # Password can be None for some setups
-                raise ValueError(f"{field.name} is required for {db_type} databases")
-        return v
+    @model_validator(mode="after")
+    def validate_db_params(self):
+        """Validate required database parameters based on type.
+
+        One model-level pass instead of a per-field validator called five
+        times per config. Password may be None for some setups.
+        """
+        if self.type in (DatabaseType.POSTGRESQL, DatabaseType.MONGODB):
+            missing = [
+                name for name in ("host", "port", "database", "username")
+                if getattr(self, name) is None
+            ]
+            if missing:
+                raise ValueError(
+                    f"{', '.join(missing)} required for {self.type} databases"
+                )
+        return self
 
 
 class CSVDataSourceConfig(BaseModel):
@@ -103,6 +129,45 @@ class ServerConfig(BaseModel):
     log_level: str = Field("info", description="Log level")
 
 
+logger = logging.getLogger(__name__)
+
+
+def _env_override_int(name: str) -> Optional[int]:
+    """Read a positive-integer env override; ignore malformed values.
+
+    A typo'd override should fall back to the config/auto-tune values
+    with a warning, not crash startup the way a bare int() would.
+    """
+    raw = os.environ.get(name)
+    if not raw:
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning(f"Ignoring non-integer {name}={raw!r}")
+        return None
+    if value < 1:
+        logger.warning(f"Ignoring non-positive {name}={raw!r}")
+        return None
+    return value
+
+
+def _available_memory_gb() -> Optional[float]:
+    """Best-effort available system memory in GiB.
+
+    Reads MemAvailable from /proc/meminfo, which accounts for reclaimable
+    page cache; returns None off Linux so callers keep their defaults.
+    """
+    try:
+        with open("/proc/meminfo", "rb") as f:
+            for line in f:
+                if line.startswith(b"MemAvailable:"):
+                    return int(line.split()[1]) / (1024 ** 2)  # kB -> GiB
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
 class PlugAndPlayConfig(BaseModel):
     """Main configuration for Plug-and-Play RAG system."""
     # System info
@@ -131,6 +196,299 @@ class PlugAndPlayConfig(BaseModel):
     enable_cors: bool = Field(True, description="Enable CORS")
     cors_origins: List[str] = Field(["*"], description="Allowed CORS origins")
 
+    @model_validator(mode="after")
+    def _autotune_batch_sizes(self):
+        """Scale ingestion buffers to the memory actually available.
+
+        The static defaults (batch_size=32, chunk_size=1000) leave most of
+        the throughput on the table on boxes with spare RAM and can OOM
+        tiny containers. When auto-ingest is on and the user has not set
+        the values explicitly, size the embedding batch from available
+        memory (32 per GiB, clamped to [32, 512]) and keep CSV chunks at
+        32x the batch so the reader stays ahead of the embedder.
+
+        Env overrides RAG_EMBED_BATCH and RAG_CSV_CHUNK win over both the
+        config file and the auto-tune.
+        """
+        if not self.auto_ingest_on_startup:
+            return self
+
+        env_batch = _env_override_int("RAG_EMBED_BATCH")
+        if env_batch:
+            self.embedding.batch_size = env_batch
+        elif "batch_size" not in self.embedding.model_fields_set:
+            avail_gb = _available_memory_gb()
+            if avail_gb is not None:
+                self.embedding.batch_size = int(min(max(32, avail_gb * 32), 512))
+
+        env_chunk = _env_override_int("RAG_CSV_CHUNK")
+        if env_chunk or self.csv_sources:
+            chunk = env_chunk or max(1000, self.embedding.batch_size * 32)
+            for src in self.csv_sources or []:
+                if env_chunk or "chunk_size" not in src.model_fields_set:
+                    src.chunk_size = chunk
+        return self
+
+    @classmethod
+    def from_trusted_dict(cls, data: Dict[str, Any]) -> "PlugAndPlayConfig":
+        """Rebuild a config from already-validated data without validators.
+
+        Used on the disk-cache hit path: the dict was produced by a fully
+        validated instance, so model_construct can skip per-field coercion
+        and the database validators. Nested sections are constructed
+        explicitly because model_construct does not recurse. The batch
+        auto-tune validator is re-applied afterwards so RAG_EMBED_BATCH /
+        RAG_CSV_CHUNK keep winning even when the YAML itself has not
+        changed since the cache was written.
+        """
+        data = dict(data)
+        data["llm"] = LLMConfig.model_construct(**data["llm"])
+        data["embedding"] = EmbeddingConfig.model_construct(**data.get("embedding", {}))
+        data["vector_db"] = VectorDBConfig.model_construct(**data.get("vector_db", {}))
+        data["server"] = ServerConfig.model_construct(**data.get("server", {}))
+        if data.get("databases"):
+            data["databases"] = {
+                name: DatabaseConfig.model_construct(**db)
+                for name, db in data["databases"].items()
+            }
+        if data.get("csv_sources"):
+            data["csv_sources"] = [
+                CSVDataSourceConfig.model_construct(**{
+                    **src,
+                    "columns": [CSVColumnConfig.model_construct(**col) for col in src["columns"]]
+                })
+                for src in data["csv_sources"]
+            ]
+        if data.get("database_sources"):
+            data["database_sources"] = [
+                DatabaseDataSourceConfig.model_construct(**src)
+                for src in data["database_sources"]
+            ]
+        return cls.model_construct(**data)._autotune_batch_sizes()
+
+
+@dataclass(frozen=True, slots=True)
+class EmbeddingSnapshot:
+    """Immutable slotted mirror of EmbeddingConfig for hot-path reads."""
+    model_name: str
+    max_seq_length: int
+    device: str
+    batch_size: int
+
+
+@dataclass(frozen=True, slots=True)
+class VectorDBSnapshot:
+    """Immutable slotted mirror of VectorDBConfig for hot-path reads."""
+    type: str
+    collection_name: str
+    persist_directory: str
+    similarity_threshold: float
+    max_results: int
+
+
+@dataclass(frozen=True, slots=True)
+class ServerSnapshot:
+    """Immutable slotted mirror of ServerConfig."""
+    host: str
+    port: int
+    reload: bool
+    workers: int
+    log_level: str
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """Slotted snapshot of the config sections read repeatedly at runtime.
+
+    Slot access skips the pydantic model __dict__ indirection; frozen
+    makes it safe to share across request handlers.
+    """
+    embedding: EmbeddingSnapshot
+    vector_db: VectorDBSnapshot
+    server: ServerSnapshot
+
+
+def snapshot_config(config: PlugAndPlayConfig) -> ConfigSnapshot:
+    """Build a frozen slotted snapshot of the hot config sections."""
+    return ConfigSnapshot(
+        embedding=EmbeddingSnapshot(**config.embedding.model_dump()),
+        vector_db=VectorDBSnapshot(**config.vector_db.model_dump()),
+        server=ServerSnapshot(**config.server.model_dump()),
+    )
+
+
+# Sample configuration, kept both as a dict for programmatic callers and
+# as pre-rendered YAML so create_sample_config is a single write_text
+# instead of a yaml.dump of the whole nested structure
+_SAMPLE_CONFIG = {
+    "app_name": "Plug-and-Play RAG",
+    "version": "1.0.0",
+    "description": "Retrieval-Augmented Generation system with multiple data sources",
+
+    "llm": {
+        "provider": "gemini",
+        "api_key": "${GEMINI_API_KEY}",  # Environment variable
+        "model_name": "gemini-pro",
+        "temperature": 0.7
+    },
+
+    "embedding": {
+        "model_name": "all-MiniLM-L6-v2",
+        "device": "cpu",
+        "batch_size": 32
+    },
+
+    "vector_db": {
+        "type": "chromadb",
+        "collection_name": "rag_documents",
+        "persist_directory": "/app/data/chroma_db",
+        "similarity_threshold": 0.7,
+        "max_results": 10
+    },
+
+    "server": {
+        "host": "0.0.0.0",
+        "port": 8000,
+        "reload": False,
+        "workers": 1,
+        "log_level": "info"
+    },
+
+    "databases": {
+        "postgres_main": {
+            "type": "postgresql",
+            "host": "${DB_HOST}",
+            "port": 5432,
+            "database": "${DB_NAME}",
+            "username": "${DB_USER}",
+            "password": "${DB_PASSWORD}"
+        }
+    },
+
+    "csv_sources": [
+        {
+            "name": "sample_articles",
+            "file_path": "sample_data.csv",
+            "delimiter": ",",
+            "has_header": True,
+            "encoding": "utf-8",
+            "columns": [
+                {
+                    "name": "title",
+                    "type": "text",
+                    "required": True
+                },
+                {
+                    "name": "content",
+                    "type": "text",
+                    "required": True
+                },
+                {
+                    "name": "category",
+                    "type": "text",
+                    "required": False
+                }
+            ],
+            "text_columns": ["title", "content"],
+            "metadata_columns": ["category"],
+            "chunk_size": 1000
+        }
+    ],
+
+    "database_sources": [
+        {
+            "name": "articles_table",
+            "database_config": "postgres_main",
+            "table_or_collection": "articles",
+            "columns_or_fields": ["title", "content", "category"],
+            "text_fields": ["title", "content"]
+        }
+    ],
+
+    "auto_ingest_on_startup": True,
+    "batch_processing": True,
+    "enable_chat_history": True,
+    "enable_streaming": True,
+    "enable_cors": True,
+    "cors_origins": ["*"]
+}
+
+# Hand-ordered rendering of _SAMPLE_CONFIG (yaml.dump would sort keys
+# alphabetically, which makes a worse starting point for humans editing it)
+_SAMPLE_YAML = """\
+app_name: Plug-and-Play RAG
+version: 1.0.0
+description: Retrieval-Augmented Generation system with multiple data sources
+
+llm:
+  provider: gemini
+  api_key: ${GEMINI_API_KEY}  # Environment variable
+  model_name: gemini-pro
+  temperature: 0.7
+
+embedding:
+  model_name: all-MiniLM-L6-v2
+  device: cpu
+  batch_size: 32
+
+vector_db:
+  type: chromadb
+  collection_name: rag_documents
+  persist_directory: /app/data/chroma_db
+  similarity_threshold: 0.7
+  max_results: 10
+
+server:
+  host: 0.0.0.0
+  port: 8000
+  reload: false
+  workers: 1
+  log_level: info
+
+databases:
+  postgres_main:
+    type: postgresql
+    host: ${DB_HOST}
+    port: 5432
+    database: ${DB_NAME}
+    username: ${DB_USER}
+    password: ${DB_PASSWORD}
+
+csv_sources:
+  - name: sample_articles
+    file_path: sample_data.csv
+    delimiter: ','
+    has_header: true
+    encoding: utf-8
+    columns:
+      - name: title
+        type: text
+        required: true
+      - name: content
+        type: text
+        required: true
+      - name: category
+        type: text
+        required: false
+    text_columns: [title, content]
+    metadata_columns: [category]
+    chunk_size: 1000
+
+database_sources:
+  - name: articles_table
+    database_config: postgres_main
+    table_or_collection: articles
+    columns_or_fields: [title, content, category]
+    text_fields: [title, content]
+
+auto_ingest_on_startup: true
+batch_processing: true
+enable_chat_history: true
+enable_streaming: true
+enable_cors: true
+cors_origins: ['*']
+"""
+
 
 class ConfigManager:
     """Manages configuration loading and validation."""
@@ -138,25 +496,81 @@ class ConfigManager:
     def __init__(self, config_path: str = "config/app_config.yaml"):
         self.config_path = Path(config_path)
         self.config: Optional[PlugAndPlayConfig] = None
-    
+        # Parsed-config disk cache, keyed on the source file's mtime and
+        # content hash; skips YAML parsing on unchanged configs across
+        # workers, reloads and CLI subprocesses
+        self._cache_path = self.config_path.with_name(
+            "." + self.config_path.name + ".cache.json"
+        )
+
     def load_config(self) -> PlugAndPlayConfig:
-        """Load configuration from file."""
+        """Load configuration from file.
+
+        Delegates to a module-level cache keyed on (path, mtime) so every
+        ConfigManager built for the same file — app factory, CLI, tests —
+        shares one parsed instance.
+        """
         if not self.config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
-        
+
+        self.config = _load_and_validate(
+            str(self.config_path.resolve()),
+            self.config_path.stat().st_mtime_ns
+        )
+        return self.config
+
+    def _load_uncached(self) -> PlugAndPlayConfig:
+        """Parse and validate the config file, using the disk cache."""
+        raw = self.config_path.read_bytes()
+        stat = self.config_path.stat()
+        digest = hashlib.sha256(raw).hexdigest()
+
+        cached_data = self._read_cache(stat.st_mtime_ns, digest)
+        if cached_data is not None:
+            # Data came from a validated instance; skip validation outright
+            self.config = PlugAndPlayConfig.from_trusted_dict(cached_data)
+            return self.config
+
         # Load YAML or JSON config
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            if self.config_path.suffix.lower() in ['.yaml', '.yml']:
-                config_data = yaml.safe_load(f)
-            elif self.config_path.suffix.lower() == '.json':
-                config_data = json.load(f)
-            else:
-                raise ValueError(f"Unsupported config file format: {self.config_path.suffix}")
-        
+        if self.config_path.suffix.lower() in ['.yaml', '.yml']:
+            config_data = yaml.load(raw, Loader=_YamlLoader)
+        elif self.config_path.suffix.lower() == '.json':
+            config_data = json.loads(raw)
+        else:
+            raise ValueError(f"Unsupported config file format: {self.config_path.suffix}")
+
         # Parse and validate
         self.config = PlugAndPlayConfig(**config_data)
+        self._write_cache(stat.st_mtime_ns, digest)
         return self.config
-    
+
+    def _read_cache(self, mtime_ns: int, digest: str) -> Optional[Dict[str, Any]]:
+        """Return cached config data if it matches the current file."""
+        try:
+            with open(self._cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached["mtime_ns"] == mtime_ns and cached["sha256"] == digest:
+                return cached["data"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _write_cache(self, mtime_ns: int, digest: str) -> None:
+        """Persist the validated config next to the source file."""
+        try:
+            payload = {
+                "mtime_ns": mtime_ns,
+                "sha256": digest,
+                "data": self.config.model_dump(mode="json")
+            }
+            tmp_path = self._cache_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self._cache_path)
+        except OSError:
+            # Cache is best-effort; a read-only config dir is fine
+            pass
+
     def get_config(self) -> PlugAndPlayConfig:
         """Get loaded configuration."""
         if self.config is None:
@@ -167,141 +581,108 @@ class ConfigManager:
         """Create a sample configuration file."""
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        sample_config = {
-            "app_name": "Plug-and-Play RAG",
-            "version": "1.0.0",
-            "description": "Retrieval-Augmented Generation system with multiple data sources",
-            
-            "llm": {
-                "provider": "gemini",
-                "api_key": "${GEMINI_API_KEY}",  # Environment variable
-                "model_name": "gemini-pro",
-                "temperature": 0.7
-            },
-            
-            "embedding": {
-                "model_name": "all-MiniLM-L6-v2",
-                "device": "cpu",
-                "batch_size": 32
-            },
-            
-            "vector_db": {
-                "type": "chromadb",
-                "collection_name": "rag_documents",
-                "persist_directory": "/app/data/chroma_db",
-                "similarity_threshold": 0.7,
-                "max_results": 10
-            },
-            
-            "server": {
-                "host": "0.0.0.0",
-                "port": 8000,
-                "reload": False,
-                "workers": 1,
-                "log_level": "info"
-            },
-            
-            "databases": {
-                "postgres_main": {
-                    "type": "postgresql",
-                    "host": "${DB_HOST}",
-                    "port": 5432,
-                    "database": "${DB_NAME}",
-                    "username": "${DB_USER}",
-                    "password": "${DB_PASSWORD}"
-                }
-            },
-            
-            "csv_sources": [
-                {
-                    "name": "sample_articles",
-                    "file_path": "sample_data.csv",
-                    "delimiter": ",",
-                    "has_header": True,
-                    "encoding": "utf-8",
-                    "columns": [
-                        {
-                            "name": "title",
-                            "type": "text",
-                            "required": True
-                        },
-                        {
-                            "name": "content", 
-                            "type": "text",
-                            "required": True
-                        },
-                        {
-                            "name": "category",
-                            "type": "text",
-                            "required": False
-                        }
-                    ],
-                    "text_columns": ["title", "content"],
-                    "metadata_columns": ["category"],
-                    "chunk_size": 1000
-                }
-            ],
-            
-            "database_sources": [
-                {
-                    "name": "articles_table",
-                    "database_config": "postgres_main",
-                    "table_or_collection": "articles",
-                    "columns_or_fields": ["title", "content", "category"],
-                    "text_fields": ["title", "content"]
-                }
-            ],
-            
-            "auto_ingest_on_startup": True,
-            "batch_processing": True,
-            "enable_chat_history": True,
-            "enable_streaming": True,
-            "enable_cors": True,
-            "cors_origins": ["*"]
-        }
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            yaml.dump(sample_config, f, default_flow_style=False, indent=2)
-        
+
+        output_path.write_text(_SAMPLE_YAML, encoding='utf-8')
+
         print(f"Sample configuration created at: {output_path}")
         return output_path
-    
+
     def validate_data_files(self) -> List[str]:
         """Validate that all referenced data files exist."""
         missing_files = []
-        
+
         if self.config and self.config.csv_sources:
             data_dir = Path("data")
+            # One directory scan instead of a stat call per source
+            try:
+                with os.scandir(data_dir) as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                names = set()
             for csv_source in self.config.csv_sources:
                 file_path = data_dir / csv_source.file_path
-                if not file_path.exists():
+                if csv_source.file_path not in names and not file_path.exists():
                     missing_files.append(str(file_path))
-        
+
         return missing_files
     
     def resolve_environment_variables(self, config_dict: Dict[str, Any]) -> Dict[str, Any]:
-        """Resolve environment variables in configuration."""
-        import re
-        
+        """Resolve environment variables in configuration.
+
+        Fast path: one orjson serialize, one C-level regex pass over the
+        bytes, one parse — instead of Python recursion rebuilding every
+        nested dict and list. Values are JSON-escaped before insertion so
+        quotes or backslashes in env vars cannot corrupt the document.
+        """
+        try:
+            data = orjson.dumps(config_dict)
+        except TypeError:
+            # Non-JSON-serializable values (e.g. YAML dates): walk in Python
+            return self._resolve_environment_variables_recursive(config_dict)
+
+        if b"${" not in data:
+            return config_dict
+
+        env_cache: Dict[bytes, bytes] = {}
+
+        def resolve_var(match) -> bytes:
+            name = match.group(1)
+            value = env_cache.get(name)
+            if value is None:
+                raw = os.environ.get(name.decode(), "")
+                # Serialize then strip the surrounding quotes to escape
+                value = env_cache[name] = orjson.dumps(raw)[1:-1]
+            return value
+
+        return orjson.loads(_ENV_VAR_RE_BYTES.sub(resolve_var, data))
+
+    def _resolve_environment_variables_recursive(
+        self, config_dict: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Recursive fallback for configs orjson cannot serialize."""
+        # Memoize env lookups for the duration of this call; the same
+        # variable often appears in several connection entries
+        env_cache: Dict[str, str] = {}
+
+        def resolve_var(match) -> str:
+            name = match.group(1)
+            value = env_cache.get(name)
+            if value is None:
+                value = env_cache[name] = os.environ.get(name, "")
+            return value
+
         def replace_env_vars(obj):
             if isinstance(obj, str):
-                # Replace ${VAR} patterns with environment variables
-                pattern = r'\$\{([^}]+)\}'
-                matches = re.findall(pattern, obj)
-                for match in matches:
-                    env_value = os.getenv(match, "")
-                    obj = obj.replace(f"${{{match}}}", env_value)
-                return obj
+                # Single linear regex pass; skip strings with no placeholder
+                if "${" not in obj:
+                    return obj
+                return _ENV_VAR_RE.sub(resolve_var, obj)
             elif isinstance(obj, dict):
                 return {k: replace_env_vars(v) for k, v in obj.items()}
             elif isinstance(obj, list):
                 return [replace_env_vars(item) for item in obj]
             return obj
-        
+
         return replace_env_vars(config_dict)
 
 
+# Force core-schema compilation at import time so the cost is paid once
+# before the first request (and shared copy-on-write with preloaded
+# workers) instead of on the first validation
+for _model in (
+    LLMConfig, DatabaseConfig, CSVDataSourceConfig, DatabaseDataSourceConfig,
+    EmbeddingConfig, VectorDBConfig, ServerConfig, PlugAndPlayConfig
+):
+    _model.model_rebuild(force=True)
+del _model
+
+
+@lru_cache(maxsize=32)
+def _load_and_validate(path: str, mtime_ns: int) -> PlugAndPlayConfig:
+    """Load a config file once per (path, mtime) across the process."""
+    return ConfigManager(path)._load_uncached()
+
+
 # Global config manager instance
 config_manager = ConfigManager()
 
@@ -312,6 +693,5 @@ def get_config() -> PlugAndPlayConfig:
 
 
 def load_config_from_file(config_path: str) -> PlugAndPlayConfig:
-    """Load configuration from a specific file."""
-    manager = ConfigManager(config_path)
-    return manager.load_config()
+    """Load configuration from a specific file (shared cache)."""
+    return ConfigManager(config_path).load_config()
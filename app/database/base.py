@@ -19,18 +19,23 @@ class DatabaseConnector(ABC):
         self,
         table_or_collection: str,
         columns_or_fields: List[str],
-        limit: int = None
-    ) -> AsyncIterator[Dict[str, Any]]:
+        limit: int = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Retrieve data from the specified table/collection.
-        
+        Retrieve data from the specified table/collection in batches.
+
+        Batches amortize cursor round-trips and await scheduling over
+        hundreds of rows instead of paying them per record.
+
         Args:
             table_or_collection: Name of table (PostgreSQL) or collection (MongoDB)
             columns_or_fields: List of columns/fields to retrieve
             limit: Maximum number of records to retrieve
-            
+            batch_size: Number of records per yielded batch
+
         Yields:
-            Dict containing record data
+            Lists of dicts containing record data, up to batch_size each
         """
         pass
     
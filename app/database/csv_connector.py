@@ -1,6 +1,13 @@
 from typing import List, Dict, Any, Optional, Iterator, AsyncGenerator
+import asyncio
+import hashlib
+import os
+import numpy as np
 import pandas as pd
-import json
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import orjson
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -9,6 +16,82 @@ from ..models import CSVConfig, CSVColumnType, CSVColumnConfig
 
 logger = logging.getLogger(__name__)
 
+_TRUTHY_VALUES = frozenset(('true', '1', 'yes', 'y'))
+
+
+def _proc_text(series: pd.Series, column_name: str):
+    """Ensure text columns are strings and map NaN to ''."""
+    return series.astype(str).replace('nan', '')
+
+
+def _proc_integer(series: pd.Series, column_name: str):
+    """Coerce to integer, defaulting unparseable values and NaN to 0."""
+    return pd.to_numeric(series, errors='coerce').fillna(0).astype(int)
+
+
+def _proc_float(series: pd.Series, column_name: str):
+    """Coerce to float, defaulting unparseable values and NaN to 0.0."""
+    return pd.to_numeric(series, errors='coerce').fillna(0.0)
+
+
+def _proc_datetime(series: pd.Series, column_name: str):
+    """Coerce to datetime; unparseable values become NaT."""
+    return pd.to_datetime(series, errors='coerce')
+
+
+def _proc_boolean(series: pd.Series, column_name: str):
+    """Convert truthy strings to bool in a single pass.
+
+    astype(str) + str.lower() + isin would walk the column three times
+    and allocate two intermediate string arrays; one fused loop over the
+    raw values does a set lookup per element instead.
+    """
+    vals = series.to_numpy(dtype=object)
+    out = np.empty(len(vals), dtype=bool)
+    for i, value in enumerate(vals):
+        out[i] = str(value).lower() in _TRUTHY_VALUES
+    return out
+
+
+def _proc_json(series: pd.Series, column_name: str):
+    """Parse JSON strings with orjson in one pass over the raw values."""
+    vals = series.to_numpy(dtype=object)
+    out = np.empty(len(vals), dtype=object)
+    for i, value in enumerate(vals):
+        if value is None or value != value or value == '':
+            out[i] = {}
+            continue
+        try:
+            out[i] = orjson.loads(
+                value if isinstance(value, (str, bytes)) else str(value)
+            )
+        except orjson.JSONDecodeError:
+            logger.warning(f"Invalid JSON in column '{column_name}': {value}")
+            out[i] = {}
+    return out
+
+
+# Type-driven dispatch replaces a per-column if/elif walk
+_COLUMN_PROCESSORS = {
+    CSVColumnType.TEXT: _proc_text,
+    CSVColumnType.INTEGER: _proc_integer,
+    CSVColumnType.FLOAT: _proc_float,
+    CSVColumnType.DATETIME: _proc_datetime,
+    CSVColumnType.BOOLEAN: _proc_boolean,
+    CSVColumnType.JSON: _proc_json,
+}
+
+# Column types pyarrow's CSV reader can convert in C++ during parsing.
+# DATETIME and JSON are absent on purpose: their coercion semantics
+# (errors='coerce', safe_json_parse) stay in _process_column.
+_ARROW_COLUMN_TYPES = {
+    CSVColumnType.TEXT: pa.string(),
+    CSVColumnType.INTEGER: pa.int64(),
+    CSVColumnType.FLOAT: pa.float64(),
+    CSVColumnType.BOOLEAN: pa.bool_(),
+}
+
+
 class CSVConnector(DatabaseConnector):
     """Database connector for CSV files."""
     
@@ -22,6 +105,16 @@ class CSVConnector(DatabaseConnector):
         self.csv_config = csv_config
         self.df: Optional[pd.DataFrame] = None
         self._validate_config()
+        # Hoisted per-record lookups: tuple preserves the configured
+        # column order for joined text, the base metadata dict is copied
+        # per record instead of rebuilt
+        self._text_columns = tuple(csv_config.text_columns)
+        self._metadata_columns = tuple(csv_config.metadata_columns or ())
+        self._base_metadata = {
+            "source": "csv",
+            "file_path": str(csv_config.file_path)
+        }
+        self._schema_info_cache: Optional[Dict[str, Any]] = None
         
     def _validate_config(self) -> None:
         """Validate CSV configuration."""
@@ -41,108 +134,322 @@ class CSVConnector(DatabaseConnector):
                 if meta_col not in column_names:
                     raise ValueError(f"Metadata column '{meta_col}' not found in column definitions")
     
+    def _arrow_streamable(self) -> bool:
+        """Whether ingestion can stream this CSV through pyarrow directly.
+
+        Eligible configs (header present, no row cap, all-text columns)
+        skip the upfront pandas load entirely and parse with pyarrow's
+        multithreaded C++ reader in fetch_in_chunks.
+        """
+        return (
+            self.csv_config.has_header
+            and self.csv_config.max_rows is None
+            and all(col.type == CSVColumnType.TEXT for col in self.csv_config.columns)
+        )
+
+    def _pandas_streamable(self) -> bool:
+        """Whether ingestion can stream this CSV through chunked pandas.
+
+        Opt-in via the streaming flag for typed configs the Arrow stream
+        cannot take; max_rows still forces a full load because pandas
+        does not combine nrows with chunksize.
+        """
+        return self.csv_config.streaming and self.csv_config.max_rows is None
+
     async def connect(self) -> None:
         """Load and process CSV file."""
+        if self._arrow_streamable() or self._pandas_streamable():
+            # Defer parsing: fetch_in_chunks streams record batches
+            # straight from the file, so there is nothing to load here.
+            # Methods that need the full dataframe load it lazily.
+            logger.info(f"CSV file will be streamed: {self.csv_config.file_path}")
+            return
+        await self._load_dataframe()
+
+    async def _load_dataframe(self) -> None:
+        """Load the whole CSV into a pandas dataframe off the event loop."""
+        await asyncio.to_thread(self._load_dataframe_sync)
+
+    def _load_dataframe_sync(self) -> None:
+        """Load the whole CSV into a pandas dataframe.
+
+        pyarrow's multithreaded C++ reader does the parsing and type
+        conversion where it can; pandas remains the fallback for configs
+        it cannot express (max_rows) or data it cannot coerce.
+        """
         try:
             logger.info(f"Loading CSV file: {self.csv_config.file_path}")
-            
-            # Read CSV file
-            read_params = {
-                'filepath_or_buffer': self.csv_config.file_path,
-                'delimiter': self.csv_config.delimiter,
-                'encoding': self.csv_config.encoding,
-                'skiprows': self.csv_config.skip_rows
-            }
-            
-            if not self.csv_config.has_header:
-                read_params['header'] = None
-                read_params['names'] = [col.name for col in self.csv_config.columns]
-            
-            if self.csv_config.max_rows:
-                read_params['nrows'] = self.csv_config.max_rows
-                
-            self.df = pd.read_csv(**read_params)
-            
-            # Process and validate data
-            await self._process_dataframe()
-            
+
+            cache_path = self._parquet_cache_path()
+            if cache_path is not None and self._read_parquet_cache(cache_path):
+                logger.info(f"Loaded CSV from parquet cache with {len(self.df)} rows")
+                return
+
+            if not self._load_dataframe_arrow():
+                # Read CSV file with pandas
+                self.df = pd.read_csv(**self._pandas_read_params())
+
+                # Process and validate data
+                self._process_dataframe(self.df)
+
+            if cache_path is not None:
+                self._write_parquet_cache(cache_path)
+
             logger.info(f"Successfully loaded CSV with {len(self.df)} rows and {len(self.df.columns)} columns")
-            
+
         except Exception as e:
             logger.error(f"Failed to load CSV file: {e}")
             raise
-    
-    async def _process_dataframe(self) -> None:
-        """Process and clean the dataframe according to column configurations."""
-        if self.df is None:
+
+    def _file_header_columns(self) -> Optional[set]:
+        """Read just the header row; None if the file cannot be probed."""
+        try:
+            return set(pd.read_csv(
+                self.csv_config.file_path,
+                delimiter=self.csv_config.delimiter,
+                encoding=self.csv_config.encoding,
+                skiprows=self.csv_config.skip_rows,
+                nrows=0
+            ).columns)
+        except (OSError, pd.errors.ParserError):
+            return None
+
+    def _pandas_read_params(self) -> Dict[str, Any]:
+        """Shared pd.read_csv arguments for full and chunked reads.
+
+        Configured string-ish columns get an explicit dtype and datetime
+        columns are parsed during the read, which skips pandas' numeric
+        inference scans over them; numeric and boolean columns keep
+        inference so _process_column's errors='coerce' semantics stand.
+        Only configured columns are read (via a callable, which unlike a
+        usecols list tolerates columns missing from the file).
+        """
+        configured = {col.name for col in self.csv_config.columns}
+        dtype_map = {
+            col.name: str for col in self.csv_config.columns
+            if col.type in (CSVColumnType.TEXT, CSVColumnType.JSON)
+        }
+        parse_dates = [
+            col.name for col in self.csv_config.columns
+            if col.type == CSVColumnType.DATETIME
+        ]
+
+        read_params = {
+            'filepath_or_buffer': self.csv_config.file_path,
+            'delimiter': self.csv_config.delimiter,
+            'encoding': self.csv_config.encoding,
+            'skiprows': self.csv_config.skip_rows,
+            'usecols': configured.__contains__,
+            'dtype': dtype_map,
+            'engine': 'c',
+            'low_memory': False,
+            # Map the file instead of copying it through stdio buffers;
+            # the parser reads straight from page cache
+            'memory_map': True
+        }
+        if parse_dates and self.csv_config.has_header:
+            # parse_dates raises on columns absent from the file (which
+            # usecols tolerates); a zero-row read of the header settles it
+            file_columns = self._file_header_columns()
+            if file_columns is None:
+                parse_dates = []
+            else:
+                parse_dates = [c for c in parse_dates if c in file_columns]
+        if parse_dates:
+            read_params['parse_dates'] = parse_dates
+            read_params['cache_dates'] = True
+
+        if not self.csv_config.has_header:
+            read_params['header'] = None
+            read_params['names'] = [col.name for col in self.csv_config.columns]
+
+        if self.csv_config.max_rows:
+            read_params['nrows'] = self.csv_config.max_rows
+
+        return read_params
+
+    def _parquet_cache_path(self) -> Optional[Path]:
+        """Sidecar parquet cache path for this file+config, or None.
+
+        The name embeds a hash of the column configuration, so a config
+        change naturally misses the old cache. JSON columns hold parsed
+        dicts that parquet cannot store, so those configs skip caching.
+        """
+        if any(col.type == CSVColumnType.JSON for col in self.csv_config.columns):
+            return None
+        path = Path(self.csv_config.file_path)
+        cfg_hash = hashlib.sha1(
+            self.csv_config.model_dump_json().encode()
+        ).hexdigest()[:12]
+        return path.with_name(f".{path.stem}.{cfg_hash}.parquet")
+
+    def _read_parquet_cache(self, cache_path: Path) -> bool:
+        """Load the processed dataframe from cache if it is still fresh."""
+        try:
+            if cache_path.stat().st_mtime_ns < os.stat(self.csv_config.file_path).st_mtime_ns:
+                return False
+            self.df = pd.read_parquet(cache_path)
+            return True
+        except OSError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parquet cache {cache_path}: {e}")
+            return False
+
+    def _write_parquet_cache(self, cache_path: Path) -> None:
+        """Persist the processed dataframe next to the CSV, best-effort."""
+        tmp_path = cache_path.with_suffix(".tmp")
+        try:
+            self.df.to_parquet(tmp_path, compression='snappy')
+            os.replace(tmp_path, cache_path)
+        except (OSError, ValueError) as e:
+            # A read-only data directory just means no cache
+            logger.debug(f"Could not write parquet cache {cache_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _load_dataframe_arrow(self) -> bool:
+        """Try loading via pyarrow; return False to fall back to pandas.
+
+        Text/integer/float/boolean columns are converted inside the Arrow
+        reader, so _process_column only runs for datetime/JSON columns;
+        the handoff to pandas is zero-copy (self_destruct releases the
+        Arrow buffers as they are consumed).
+        """
+        if self.csv_config.max_rows is not None:
+            # Arrow's reader has no row cap; pandas nrows handles it
+            return False
+
+        column_types = {
+            col.name: _ARROW_COLUMN_TYPES.get(col.type, pa.string())
+            for col in self.csv_config.columns
+        }
+        converted = frozenset(
+            col.name for col in self.csv_config.columns
+            if col.type in _ARROW_COLUMN_TYPES
+        )
+
+        read_options = pa_csv.ReadOptions(
+            block_size=8 << 20,
+            skip_rows=self.csv_config.skip_rows,
+            encoding=self.csv_config.encoding
+        )
+        if not self.csv_config.has_header:
+            read_options.column_names = [col.name for col in self.csv_config.columns]
+
+        convert_options = pa_csv.ConvertOptions(column_types=column_types)
+        if self.csv_config.has_header:
+            # Parse only configured columns, like the pandas path's
+            # usecols; restricted to names the header actually has so a
+            # missing column stays missing (and hits the required/default
+            # logic) instead of erroring inside the reader
+            file_columns = self._file_header_columns()
+            if file_columns is not None:
+                convert_options.include_columns = [
+                    col.name for col in self.csv_config.columns
+                    if col.name in file_columns
+                ]
+
+        # Memory-map the source so the reader works against the page
+        # cache directly instead of a user-space copy of the file
+        source = None
+        try:
+            source = pa.memory_map(self.csv_config.file_path)
+        except OSError:
+            pass
+
+        try:
+            table = pa_csv.read_csv(
+                source if source is not None else self.csv_config.file_path,
+                read_options=read_options,
+                parse_options=pa_csv.ParseOptions(delimiter=self.csv_config.delimiter),
+                convert_options=convert_options
+            )
+            self.df = table.to_pandas(self_destruct=True, split_blocks=True)
+        except pa.ArrowInvalid as e:
+            # e.g. a boolean column using yes/no, or malformed rows the
+            # pandas coercion path tolerates
+            logger.warning(f"pyarrow CSV read failed, falling back to pandas: {e}")
+            self.df = None
+            return False
+        finally:
+            if source is not None:
+                source.close()
+
+        self._process_dataframe(self.df, converted=converted)
+        return True
+
+    def _process_dataframe(self, frame: pd.DataFrame, converted: frozenset = frozenset()) -> None:
+        """Process and clean a dataframe according to column configurations.
+
+        Operates on the given frame in place so both the full-load path
+        and per-chunk streaming reuse it. Columns named in `converted`
+        were already type-cast by the Arrow reader and only get null
+        backfilling.
+        """
+        if frame is None:
             raise ValueError("DataFrame not loaded")
-            
+
         # Create column mapping for processing
         column_configs = {col.name: col for col in self.csv_config.columns}
-        
-        for column_name in self.df.columns:
+
+        for column_name in frame.columns:
             if column_name in column_configs:
                 col_config = column_configs[column_name]
-                await self._process_column(column_name, col_config)
+                if column_name in converted:
+                    self._fill_column_nulls(frame, column_name, col_config)
+                else:
+                    self._process_column(frame, column_name, col_config)
             else:
                 logger.warning(f"Column '{column_name}' found in CSV but not in configuration")
         
         # Handle missing required columns
         for col_config in self.csv_config.columns:
-            if col_config.required and col_config.name not in self.df.columns:
+            if col_config.required and col_config.name not in frame.columns:
                 if col_config.default_value is not None:
-                    self.df[col_config.name] = col_config.default_value
+                    frame[col_config.name] = col_config.default_value
                     logger.info(f"Added missing required column '{col_config.name}' with default value")
                 else:
                     raise ValueError(f"Required column '{col_config.name}' missing and no default value provided")
-    
-    async def _process_column(self, column_name: str, config: CSVColumnConfig) -> None:
+
+    def _fill_column_nulls(self, frame: pd.DataFrame, column_name: str, config: CSVColumnConfig) -> None:
+        """Backfill nulls in a column the Arrow reader already typed.
+
+        Mirrors _process_column's defaults: '' for text, 0/0.0 for
+        numerics, False for booleans. Integer columns come back as float
+        when Arrow saw nulls, so they are re-cast after the fill.
+        """
+        series = frame[column_name]
+        if not series.isna().any():
+            return
+
+        if config.type == CSVColumnType.TEXT:
+            frame[column_name] = series.fillna('')
+        elif config.type == CSVColumnType.INTEGER:
+            frame[column_name] = series.fillna(0).astype(int)
+        elif config.type == CSVColumnType.FLOAT:
+            frame[column_name] = series.fillna(0.0)
+        elif config.type == CSVColumnType.BOOLEAN:
+            frame[column_name] = series.fillna(False).astype(bool)
+
+    def _process_column(self, frame: pd.DataFrame, column_name: str, config: CSVColumnConfig) -> None:
         """Process individual column according to its configuration."""
         try:
-            if config.type == CSVColumnType.TEXT:
-                # Ensure text columns are strings and handle NaN
-                self.df[column_name] = self.df[column_name].astype(str).replace('nan', '')
-                
-            elif config.type == CSVColumnType.INTEGER:
-                # Convert to integer, handling NaN
-                self.df[column_name] = pd.to_numeric(self.df[column_name], errors='coerce').fillna(0).astype(int)
-                
-            elif config.type == CSVColumnType.FLOAT:
-                # Convert to float, handling NaN
-                self.df[column_name] = pd.to_numeric(self.df[column_name], errors='coerce').fillna(0.0)
-                
-            elif config.type == CSVColumnType.DATETIME:
-                # Convert to datetime
-                self.df[column_name] = pd.to_datetime(self.df[column_name], errors='coerce')
-                
-            elif config.type == CSVColumnType.BOOLEAN:
-                # Convert to boolean
-                self.df[column_name] = self.df[column_name].astype(str).str.lower().isin(['true', '1', 'yes', 'y'])
-                
-            elif config.type == CSVColumnType.JSON:
-                # Parse JSON strings
-                def safe_json_parse(value):
-                    try:
-                        if pd.isna(value) or value == '':
-                            return {}
-                        return json.loads(str(value))
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid JSON in column '{column_name}': {value}")
-                        return {}
-                
-                self.df[column_name] = self.df[column_name].apply(safe_json_parse)
-                
+            processor = _COLUMN_PROCESSORS.get(config.type)
+            if processor is not None:
+                frame[column_name] = processor(frame[column_name], column_name)
+
         except Exception as e:
             logger.error(f"Error processing column '{column_name}': {e}")
             # Fill with default value if processing fails
             if config.default_value is not None:
-                self.df[column_name] = config.default_value
+                frame[column_name] = config.default_value
             else:
                 raise
     
     async def disconnect(self) -> None:
         """Clean up resources."""
         self.df = None
+        self._schema_info_cache = None
         logger.info("CSV connector disconnected")
     
     async def fetch_data(
@@ -165,48 +472,56 @@ class CSVConnector(DatabaseConnector):
             List of dictionaries representing rows
         """
         if self.df is None:
-            raise ValueError("CSV not loaded. Call connect() first.")
-        
-        # Create working dataframe
-        working_df = self.df.copy()
-        
-        # Select specific columns if requested
+            await self._load_dataframe()
+
+        # Slice rows first, then project columns; both are views or cheap
+        # shallow copies, so nothing is materialized until the records
+        # are built (the old full df.copy() scaled with the whole file)
+        end = offset + limit if limit is not None else len(self.df)
+        working_df = self.df.iloc[offset:end]
+
         if columns:
             available_columns = [col for col in columns if col in working_df.columns]
             if not available_columns:
                 logger.warning("No requested columns found in CSV")
                 return []
             working_df = working_df[available_columns]
-        
-        # Apply offset and limit
-        if offset > 0:
-            working_df = working_df.iloc[offset:]
-        if limit:
-            working_df = working_df.head(limit)
-        
+
         # Convert to list of dictionaries
-        records = working_df.to_dict('records')
-        
-        # Clean up records (convert NaN to None, etc.)
-        cleaned_records = []
-        for record in records:
-            cleaned_record = {}
-            for key, value in record.items():
-                if pd.isna(value):
-                    cleaned_record[key] = None
-                elif isinstance(value, pd.Timestamp):
-                    cleaned_record[key] = value.isoformat()
-                else:
-                    cleaned_record[key] = value
-            cleaned_records.append(cleaned_record)
-        
+        cleaned_records = self._records_from_frame(working_df)
+
         logger.info(f"Fetched {len(cleaned_records)} records from CSV")
         return cleaned_records
-    
-    async def disconnect(self) -> None:
-        """Close CSV connector (no-op for CSV files)."""
-        logger.info("CSV connector closed")
-        
+
+    @staticmethod
+    def _records_from_frame(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Convert a dataframe to cleaned records (NaN->None, dates->ISO).
+
+        The cleanup runs column-wise in pandas/NumPy before a single
+        to_dict('records') call, instead of revisiting every cell of
+        every row in Python afterwards.
+        """
+        columns = list(frame.columns)
+        column_values = []
+        for column in columns:
+            series = frame[column]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                values = series.dt.strftime('%Y-%m-%dT%H:%M:%S').to_numpy(dtype=object)
+                values[series.isna().to_numpy()] = None
+                column_values.append(values.tolist())
+            else:
+                mask = series.isna()
+                if mask.any():
+                    values = series.to_numpy(dtype=object)
+                    values[mask.to_numpy()] = None
+                    column_values.append(values.tolist())
+                else:
+                    column_values.append(series.tolist())
+
+        # Records are zipped from the cleaned columns directly; writing
+        # them back into a frame would coerce the Nones to NaN again
+        return [dict(zip(columns, row)) for row in zip(*column_values)]
+
     async def test_connection(self) -> bool:
         """Test if the CSV file can be read."""
         try:
@@ -227,15 +542,25 @@ class CSVConnector(DatabaseConnector):
         return schema
     
     async def get_data(
-        self, 
-        table_or_collection: str, 
-        columns_or_fields: List[str], 
-        limit: int = None
-    ) -> AsyncGenerator[Dict[str, Any], None]:
-        """Get data from CSV file."""
+        self,
+        table_or_collection: str,
+        columns_or_fields: List[str],
+        limit: int = None,
+        batch_size: int = 1000
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Get data from CSV file in batches."""
+        if self.df is None and self._arrow_projectable(columns_or_fields):
+            # Parse only the requested columns straight off the file
+            # instead of loading and keeping every column in RAM
+            async for records in self._stream_projected_columns(
+                columns_or_fields, limit, batch_size
+            ):
+                yield records
+            return
+
         if self.df is None:
-            await self.connect()
-            
+            await self._load_dataframe()
+
         # Filter columns if specified
         if columns_or_fields:
             available_columns = [col for col in columns_or_fields if col in self.df.columns]
@@ -245,14 +570,107 @@ class CSVConnector(DatabaseConnector):
                 df_subset = self.df
         else:
             df_subset = self.df
-            
+
         # Apply limit if specified
         if limit:
             df_subset = df_subset.head(limit)
-            
-        # Yield records one by one
-        for _, row in df_subset.iterrows():
-            yield row.to_dict()
+
+        # Yield slices built column-wise; no per-row Series or per-cell
+        # Python cleanup pass
+        for start in range(0, len(df_subset), batch_size):
+            yield self._records_from_frame(df_subset.iloc[start:start + batch_size])
+
+    def _arrow_projectable(self, columns_or_fields: Optional[List[str]]) -> bool:
+        """Whether get_data can column-prune this request with Arrow.
+
+        Requires a header to project by name, no row cap, and every
+        requested column configured with a type the Arrow reader converts
+        itself (datetime/JSON columns need the pandas post-processing).
+        """
+        if not columns_or_fields:
+            return False
+        if not self.csv_config.has_header or self.csv_config.max_rows is not None:
+            return False
+        arrow_typed = {
+            col.name for col in self.csv_config.columns
+            if col.type in _ARROW_COLUMN_TYPES
+        }
+        return all(name in arrow_typed for name in columns_or_fields)
+
+    async def _stream_projected_columns(
+        self,
+        columns_or_fields: List[str],
+        limit: Optional[int],
+        batch_size: int
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Stream record batches containing only the requested columns."""
+        requested = list(dict.fromkeys(columns_or_fields))
+        column_configs = {col.name: col for col in self.csv_config.columns}
+        fill_values = {
+            CSVColumnType.TEXT: "",
+            CSVColumnType.INTEGER: 0,
+            CSVColumnType.FLOAT: 0.0,
+            CSVColumnType.BOOLEAN: False,
+        }
+
+        def open_reader():
+            return pa_csv.open_csv(
+                self.csv_config.file_path,
+                read_options=pa_csv.ReadOptions(
+                    block_size=8 << 20,
+                    skip_rows=self.csv_config.skip_rows,
+                    encoding=self.csv_config.encoding
+                ),
+                parse_options=pa_csv.ParseOptions(delimiter=self.csv_config.delimiter),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=requested,
+                    # Tolerate columns absent from the file (they arrive
+                    # all-null and are backfilled like load-time nulls)
+                    include_missing_columns=True,
+                    column_types={
+                        name: _ARROW_COLUMN_TYPES[column_configs[name].type]
+                        for name in requested
+                    }
+                )
+            )
+
+        def next_records(remaining: Optional[int]):
+            # StopIteration cannot cross a thread boundary; map it to None
+            try:
+                batch = reader.read_next_batch()
+            except StopIteration:
+                return None
+            if remaining is not None and batch.num_rows > remaining:
+                batch = batch.slice(0, remaining)
+            # Null backfill runs vectorized in Arrow, matching the
+            # defaults _process_column applies on the full-load path
+            arrays = [
+                pc.fill_null(
+                    batch.column(i),
+                    fill_values[column_configs[name].type]
+                )
+                for i, name in enumerate(batch.schema.names)
+            ]
+            return pa.RecordBatch.from_arrays(arrays, batch.schema.names).to_pylist()
+
+        reader = await asyncio.to_thread(open_reader)
+        remaining = limit
+        buffered: List[Dict[str, Any]] = []
+        try:
+            while remaining is None or remaining > 0:
+                records = await asyncio.to_thread(next_records, remaining)
+                if records is None:
+                    break
+                if remaining is not None:
+                    remaining -= len(records)
+                buffered.extend(records)
+                while len(buffered) >= batch_size:
+                    yield buffered[:batch_size]
+                    buffered = buffered[batch_size:]
+            if buffered:
+                yield buffered
+        finally:
+            reader.close()
 
     def get_text_content(self, record: Dict[str, Any]) -> str:
         """
@@ -265,12 +683,13 @@ class CSVConnector(DatabaseConnector):
             Combined text content from configured text columns
         """
         text_parts = []
-        for column in self.csv_config.text_columns:
-            if column in record and record[column] is not None:
-                text_content = str(record[column]).strip()
+        for column in self._text_columns:
+            value = record.get(column)
+            if value is not None:
+                text_content = str(value).strip()
                 if text_content:
                     text_parts.append(text_content)
-        
+
         return " ".join(text_parts)
     
     def get_metadata(self, record: Dict[str, Any]) -> Dict[str, Any]:
@@ -283,17 +702,13 @@ class CSVConnector(DatabaseConnector):
         Returns:
             Metadata dictionary
         """
-        metadata = {
-            "source": "csv",
-            "file_path": str(self.csv_config.file_path)
-        }
-        
+        metadata = self._base_metadata.copy()
+
         # Add configured metadata columns
-        if self.csv_config.metadata_columns:
-            for column in self.csv_config.metadata_columns:
-                if column in record:
-                    metadata[column] = record[column]
-        
+        for column in self._metadata_columns:
+            if column in record:
+                metadata[column] = record[column]
+
         # Add row index if available
         if 'index' in record:
             metadata['row_index'] = record['index']
@@ -311,34 +726,147 @@ class CSVConnector(DatabaseConnector):
             Chunks of data as list of dictionaries
         """
         if self.df is None:
+            if self._arrow_streamable():
+                async for records in self._stream_arrow_chunks():
+                    yield records
+                return
+            if self._pandas_streamable():
+                async for records in self._stream_pandas_chunks(chunk_size):
+                    yield records
+                return
             raise ValueError("CSV not loaded. Call connect() first.")
-        
+
         chunk_size = chunk_size or self.csv_config.chunk_size
         total_rows = len(self.df)
         
         for start_idx in range(0, total_rows, chunk_size):
             end_idx = min(start_idx + chunk_size, total_rows)
-            chunk_df = self.df.iloc[start_idx:end_idx]
-            
-            # Convert chunk to records
-            records = chunk_df.to_dict('records')
-            
-            # Clean up records
-            cleaned_records = []
-            for record in records:
-                cleaned_record = {}
-                for key, value in record.items():
-                    if pd.isna(value):
-                        cleaned_record[key] = None
-                    elif isinstance(value, pd.Timestamp):
-                        cleaned_record[key] = value.isoformat()
-                    else:
-                        cleaned_record[key] = value
-                cleaned_records.append(cleaned_record)
-            
+            cleaned_records = self._records_from_frame(self.df.iloc[start_idx:end_idx])
+
             logger.debug(f"Yielding chunk {start_idx}-{end_idx} with {len(cleaned_records)} records")
             yield cleaned_records
-    
+
+    async def _stream_pandas_chunks(
+        self, chunk_size: Optional[int] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Stream typed CSV chunks with pandas' chunked reader.
+
+        Each chunk is parsed, column-processed and converted to records
+        inside a worker thread, so peak memory is one chunk rather than
+        the whole file and the event loop stays responsive.
+        """
+        read_params = self._pandas_read_params()
+        read_params['chunksize'] = chunk_size or self.csv_config.chunk_size
+
+        reader = await asyncio.to_thread(pd.read_csv, **read_params)
+
+        def next_records():
+            # StopIteration cannot cross a thread boundary; map it to None
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return None
+            self._process_dataframe(chunk)
+            return self._records_from_frame(chunk)
+
+        try:
+            while True:
+                records = await asyncio.to_thread(next_records)
+                if records is None:
+                    break
+                if records:
+                    yield records
+        finally:
+            reader.close()
+
+    async def fetch_in_batches(
+        self, chunk_size: Optional[int] = None
+    ) -> AsyncGenerator[pa.RecordBatch, None]:
+        """Fetch data as Arrow record batches instead of lists of dicts.
+
+        Columnar batches skip the per-row dict materialization of
+        fetch_in_chunks, so consumers that only need a few columns can
+        pull them with batch.column(name) while the rest stays in packed
+        Arrow buffers.
+
+        Args:
+            chunk_size: Rows per batch (uses config default if not provided)
+
+        Yields:
+            pyarrow.RecordBatch per chunk
+        """
+        if self.df is None and self._arrow_streamable():
+            async for batch in self._stream_arrow_batches():
+                yield batch
+            return
+
+        if self.df is None:
+            await self._load_dataframe()
+
+        chunk_size = chunk_size or self.csv_config.chunk_size
+        table = pa.Table.from_pandas(self.df, preserve_index=False)
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            yield batch
+
+    async def _stream_arrow_chunks(self) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Stream chunks as record dicts via the Arrow batch reader."""
+        async for batch in self._stream_arrow_batches():
+            yield batch.to_pylist()
+
+    async def _stream_arrow_batches(self) -> AsyncGenerator[pa.RecordBatch, None]:
+        """Stream record batches with pyarrow's C++ CSV reader.
+
+        Only the text and metadata columns are materialized, and rows
+        never pass through pandas; batch parsing runs in a worker thread
+        so the event loop stays responsive.
+        """
+        include_columns = list(dict.fromkeys(
+            self.csv_config.text_columns + (self.csv_config.metadata_columns or [])
+        ))
+
+        def open_reader():
+            return pa_csv.open_csv(
+                self.csv_config.file_path,
+                read_options=pa_csv.ReadOptions(
+                    block_size=8 << 20,
+                    skip_rows=self.csv_config.skip_rows,
+                    encoding=self.csv_config.encoding
+                ),
+                parse_options=pa_csv.ParseOptions(delimiter=self.csv_config.delimiter),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=include_columns,
+                    # Tolerate columns absent from the file (they arrive
+                    # all-null and are backfilled below), matching the
+                    # full-load path's missing-column handling
+                    include_missing_columns=True,
+                    column_types={name: pa.string() for name in include_columns}
+                )
+            )
+
+        def next_batch():
+            # StopIteration cannot cross a thread boundary; map it to None
+            try:
+                batch = reader.read_next_batch()
+            except StopIteration:
+                return None
+            # Backfill nulls with '' like the full-load text defaults
+            arrays = [
+                pc.fill_null(batch.column(i), "")
+                for i in range(batch.num_columns)
+            ]
+            return pa.RecordBatch.from_arrays(arrays, batch.schema.names)
+
+        reader = await asyncio.to_thread(open_reader)
+        try:
+            while True:
+                batch = await asyncio.to_thread(next_batch)
+                if batch is None:
+                    break
+                if batch.num_rows:
+                    yield batch
+        finally:
+            reader.close()
+
     def get_schema_info(self) -> Dict[str, Any]:
         """
         Get information about the CSV schema.
@@ -346,26 +874,38 @@ class CSVConnector(DatabaseConnector):
         Returns:
             Dictionary containing schema information
         """
+        if self._schema_info_cache is not None:
+            return self._schema_info_cache
+
         if self.df is None:
-            return {"error": "CSV not loaded"}
-        
+            # Schema inspection needs the full dataframe even for CSVs
+            # that ingestion streams through pyarrow
+            self._load_dataframe_sync()
+
         schema_info = {
             "file_path": str(self.csv_config.file_path),
             "total_rows": len(self.df),
             "total_columns": len(self.df.columns),
             "columns": {}
         }
-        
+
         # Add column information
+        column_configs = {c.name: c for c in self.csv_config.columns}
+        text_columns = set(self._text_columns)
+        metadata_columns = set(self._metadata_columns)
         for column in self.df.columns:
-            col_config = next((c for c in self.csv_config.columns if c.name == column), None)
+            col_config = column_configs.get(column)
+            series = self.df[column]
+            # One null scan yields both counts
+            null_count = int(series.isnull().sum())
             schema_info["columns"][column] = {
-                "dtype": str(self.df[column].dtype),
-                "non_null_count": int(self.df[column].count()),
-                "null_count": int(self.df[column].isnull().sum()),
+                "dtype": str(series.dtype),
+                "non_null_count": len(series) - null_count,
+                "null_count": null_count,
                 "configured_type": col_config.type if col_config else "unknown",
-                "is_text_column": column in self.csv_config.text_columns,
-                "is_metadata_column": column in (self.csv_config.metadata_columns or [])
+                "is_text_column": column in text_columns,
+                "is_metadata_column": column in metadata_columns
             }
-        
+
+        self._schema_info_cache = schema_info
         return schema_info
@@ -1,4 +1,6 @@
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Tuple
+from ..config import settings
 from ..models import DatabaseType, CSVConfig
 from ..database.base import DatabaseConnector
 from ..database.postgresql import PostgreSQLConnector
@@ -6,23 +8,47 @@ from ..database.mongodb import MongoDBConnector
 from ..database.csv_connector import CSVConnector
 
 class DatabaseFactory:
-    """Factory class for creating database connectors."""
-    
+    """Factory class for creating database connectors.
+
+    Connectors are pooled by (db_type, connection_params) so repeated
+    ingests against the same source reuse the established connection
+    instead of paying the TCP/TLS/auth handshake every run. Entries idle
+    longer than DB_POOL_IDLE_TIMEOUT seconds are closed lazily.
+    """
+
+    def __init__(self):
+        self._pool: Dict[Tuple, DatabaseConnector] = {}
+        self._last_used: Dict[Tuple, float] = {}
+
     @staticmethod
+    def _pool_key(db_type: DatabaseType, connection_params: Dict[str, Any]) -> Tuple:
+        return (db_type, tuple(sorted((k, str(v)) for k, v in connection_params.items())))
+
     async def create_connector(
+        self,
         db_type: DatabaseType,
         connection_params: Dict[str, Any]
     ) -> DatabaseConnector:
         """
         Create and return appropriate database connector.
-        
+
         Args:
             db_type: Type of database (postgresql, mongodb, or csv)
             connection_params: Connection parameters
-            
+
         Returns:
             Initialized database connector
         """
+        key = self._pool_key(db_type, connection_params)
+        now = time.monotonic()
+
+        await self._evict_idle(now)
+
+        connector = self._pool.get(key)
+        if connector is not None:
+            self._last_used[key] = now
+            return connector
+
         if db_type == DatabaseType.POSTGRESQL:
             connector = PostgreSQLConnector(connection_params)
         elif db_type == DatabaseType.MONGODB:
@@ -33,6 +59,30 @@ class DatabaseFactory:
             connector = CSVConnector(csv_config)
         else:
             raise ValueError(f"Unsupported database type: {db_type}")
-        
+
         await connector.connect()
+        self._pool[key] = connector
+        self._last_used[key] = now
         return connector
+
+    async def _evict_idle(self, now: float) -> None:
+        """Disconnect and drop connectors idle beyond the timeout."""
+        expired = [
+            key for key, used in self._last_used.items()
+            if now - used > settings.DB_POOL_IDLE_TIMEOUT
+        ]
+        for key in expired:
+            connector = self._pool.pop(key, None)
+            self._last_used.pop(key, None)
+            if connector is not None:
+                await connector.disconnect()
+
+    async def close_all(self) -> None:
+        """Disconnect every pooled connector (shutdown hook)."""
+        for connector in self._pool.values():
+            await connector.disconnect()
+        self._pool.clear()
+        self._last_used.clear()
+
+# Shared instance so the connector pool spans the whole application
+db_factory = DatabaseFactory()
@@ -52,27 +52,34 @@ class MongoDBConnector(DatabaseConnector):
         self,
         table_or_collection: str,
         columns_or_fields: List[str],
-        limit: int = None
-    ) -> AsyncIterator[Dict[str, Any]]:
-        """Retrieve data from MongoDB collection."""
+        limit: int = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Retrieve data from MongoDB collection in batches."""
         if not self.database:
             await self.connect()
-        
+
         try:
             collection = self.database[table_or_collection]
-            
+
             # Create projection for specified fields
             projection = {field: 1 for field in columns_or_fields}
             projection["_id"] = 0  # Exclude _id field by default
-            
-            cursor = collection.find({}, projection)
-            
+
+            # Align the wire batch size with the yielded batch size
+            cursor = collection.find({}, projection).batch_size(batch_size)
+
             if limit:
                 cursor = cursor.limit(limit)
-            
-            async for document in cursor:
-                yield document
-                
+
+            # Drain the cursor a full wire batch at a time; one awaitable
+            # then covers batch_size documents instead of one each
+            while True:
+                batch = await cursor.to_list(length=batch_size)
+                if not batch:
+                    break
+                yield batch
+
         except Exception as e:
             logger.error(f"Error retrieving data from MongoDB: {e}")
             raise
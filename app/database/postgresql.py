@@ -1,10 +1,69 @@
+import asyncio
+import io
+
 import asyncpg
+import pyarrow.csv as pa_csv
 from typing import List, Dict, Any, AsyncIterator
 import logging
 from ..database.base import DatabaseConnector
 
 logger = logging.getLogger(__name__)
 
+
+# Process-wide pools keyed by server/database/user so every connector to
+# the same database shares connections instead of paying its own
+# TCP/TLS/auth handshakes. Refcounted: the pool closes when the last
+# connector using it disconnects.
+_POOLS: Dict[tuple, asyncpg.Pool] = {}
+_POOL_REFS: Dict[tuple, int] = {}
+_POOL_LOCK = asyncio.Lock()
+
+
+def _quote_ident(name: str) -> str:
+    """Quote a SQL identifier, allowing schema-qualified table names."""
+    return ".".join(
+        '"' + part.replace('"', '""') + '"' for part in name.split(".")
+    )
+
+
+class _QueueByteStream(io.RawIOBase):
+    """Blocking file-like view over an asyncio.Queue of byte chunks.
+
+    Lets pyarrow's CSV reader (running in a worker thread) consume bytes
+    that asyncpg's COPY callback produces on the event loop. An empty
+    chunk marks end-of-stream.
+    """
+
+    def __init__(self, queue: "asyncio.Queue[bytes]", loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self._queue = queue
+        self._loop = loop
+        self._buffer = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, nbytes: int = -1) -> bytes:
+        while not self._eof and (nbytes < 0 or len(self._buffer) < nbytes):
+            chunk = asyncio.run_coroutine_threadsafe(
+                self._queue.get(), self._loop
+            ).result()
+            if not chunk:
+                self._eof = True
+                break
+            self._buffer += chunk
+        if nbytes < 0:
+            out, self._buffer = self._buffer, b""
+        else:
+            out, self._buffer = self._buffer[:nbytes], self._buffer[nbytes:]
+        return out
+
+    def readinto(self, b) -> int:
+        chunk = self.read(len(b))
+        b[:len(chunk)] = chunk
+        return len(chunk)
+
 class PostgreSQLConnector(DatabaseConnector):
     """PostgreSQL database connector."""
     
@@ -12,56 +71,184 @@ class PostgreSQLConnector(DatabaseConnector):
         self.connection_params = connection_params
         self.connection = None
         self.pool = None
-    
+        self._pool_key = None
+        self._schema_cache: Dict[str, Dict[str, str]] = {}
+
     async def connect(self) -> None:
-        """Establish PostgreSQL connection pool."""
+        """Attach to the shared PostgreSQL pool for these parameters."""
+        host = self.connection_params.get("host", "localhost")
+        port = self.connection_params.get("port", 5432)
+        user = self.connection_params.get("user")
+        database = self.connection_params.get("database")
+        key = (host, port, database, user)
+
         try:
-            self.pool = await asyncpg.create_pool(
-                host=self.connection_params.get("host", "localhost"),
-                port=self.connection_params.get("port", 5432),
-                user=self.connection_params.get("user"),
-                password=self.connection_params.get("password"),
-                database=self.connection_params.get("database"),
-                min_size=1,
-                max_size=10
-            )
-            logger.info("PostgreSQL connection pool created successfully")
+            async with _POOL_LOCK:
+                pool = _POOLS.get(key)
+                if pool is None:
+                    pool = await asyncpg.create_pool(
+                        host=host,
+                        port=port,
+                        user=user,
+                        password=self.connection_params.get("password"),
+                        database=database,
+                        min_size=1,
+                        max_size=10
+                    )
+                    _POOLS[key] = pool
+                    logger.info("PostgreSQL connection pool created successfully")
+                _POOL_REFS[key] = _POOL_REFS.get(key, 0) + 1
+            self.pool = pool
+            self._pool_key = key
         except Exception as e:
             logger.error(f"Failed to create PostgreSQL connection pool: {e}")
             raise
-    
+
     async def disconnect(self) -> None:
-        """Close PostgreSQL connection pool."""
-        if self.pool:
-            await self.pool.close()
-            logger.info("PostgreSQL connection pool closed")
+        """Detach from the shared pool, closing it with the last user."""
+        if not self.pool:
+            return
+        key, self.pool, self._pool_key = self._pool_key, None, None
+        async with _POOL_LOCK:
+            _POOL_REFS[key] -= 1
+            if _POOL_REFS[key] > 0:
+                return
+            pool = _POOLS.pop(key)
+            del _POOL_REFS[key]
+        await pool.close()
+        logger.info("PostgreSQL connection pool closed")
     
     async def get_data(
         self,
         table_or_collection: str,
         columns_or_fields: List[str],
-        limit: int = None
-    ) -> AsyncIterator[Dict[str, Any]]:
-        """Retrieve data from PostgreSQL table."""
+        limit: int = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Retrieve data from PostgreSQL table in batches."""
         if not self.pool:
             await self.connect()
-        
-        # Build SQL query
-        columns_str = ", ".join(columns_or_fields)
-        query = f"SELECT {columns_str} FROM {table_or_collection}"
-        
+
+        # Build SQL query with quoted identifiers; names come from config,
+        # but quoting closes the injection hole and keeps odd column
+        # names (mixed case, spaces) working
+        columns_str = ", ".join(_quote_ident(col) for col in columns_or_fields)
+        query = f"SELECT {columns_str} FROM {_quote_ident(table_or_collection)}"
+
         if limit:
-            query += f" LIMIT {limit}"
-        
+            query += f" LIMIT {int(limit)}"
+
         try:
             async with self.pool.acquire() as connection:
                 logger.info(f"Executing query: {query}")
+                copy_yielded = False
+                try:
+                    async for records in self._copy_records(connection, query, batch_size):
+                        copy_yielded = True
+                        yield records
+                    return
+                except asyncpg.PostgresError as e:
+                    if copy_yielded:
+                        # Re-running the query after batches went out
+                        # would duplicate rows downstream; only an
+                        # untouched stream may fall back
+                        raise
+                    # e.g. COPY permission withheld; the cursor path below
+                    # costs more CPU per row but always works
+                    logger.warning(f"COPY streaming failed, using cursor protocol: {e}")
+
                 async with connection.transaction():
-                    async for record in connection.cursor(query):
-                        yield dict(record)
+                    # fetchmany-style batching: one round-trip per
+                    # batch_size rows instead of per row
+                    cursor = await connection.cursor(query)
+                    keys = None
+                    while True:
+                        records = await cursor.fetch(batch_size)
+                        if not records:
+                            break
+                        if keys is None:
+                            # Resolve field names once per query; zip
+                            # skips Record introspection on every row
+                            keys = tuple(records[0].keys())
+                        yield [dict(zip(keys, record)) for record in records]
         except Exception as e:
             logger.error(f"Error retrieving data from PostgreSQL: {e}")
             raise
+
+    async def _copy_records(
+        self,
+        connection,
+        query: str,
+        batch_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream query results via COPY instead of the cursor protocol.
+
+        COPY emits rows in bulk with far less per-row server and protocol
+        work than extended-query fetches. The CSV byte stream is parsed
+        incrementally by pyarrow's C++ reader in a worker thread, so rows
+        reach Python as typed record batches, not per-row tuples.
+        """
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=4)
+
+        async def sink(data: bytes) -> None:
+            await queue.put(bytes(data))
+
+        async def run_copy() -> None:
+            try:
+                await connection.copy_from_query(
+                    query, output=sink, format='csv', header=True
+                )
+            finally:
+                await queue.put(b"")
+
+        copy_task = asyncio.create_task(run_copy())
+        stream = _QueueByteStream(queue, loop)
+
+        def open_reader():
+            return pa_csv.open_csv(
+                stream,
+                read_options=pa_csv.ReadOptions(block_size=1 << 20)
+            )
+
+        def next_batch():
+            # StopIteration cannot cross a thread boundary; map it to None
+            try:
+                return reader.read_next_batch()
+            except StopIteration:
+                return None
+
+        reader = None
+        buffered: List[Dict[str, Any]] = []
+        try:
+            try:
+                reader = await asyncio.to_thread(open_reader)
+            except Exception as arrow_error:
+                # A failed COPY leaves the stream empty and Arrow errors
+                # first; surface the underlying Postgres error instead
+                if copy_task.done() and copy_task.exception() is not None:
+                    raise copy_task.exception() from arrow_error
+                raise
+            while True:
+                batch = await asyncio.to_thread(next_batch)
+                if batch is None:
+                    break
+                buffered.extend(batch.to_pylist())
+                while len(buffered) >= batch_size:
+                    yield buffered[:batch_size]
+                    buffered = buffered[batch_size:]
+            await copy_task
+            if buffered:
+                yield buffered
+        finally:
+            if not copy_task.done():
+                copy_task.cancel()
+                try:
+                    await copy_task
+                except (asyncio.CancelledError, Exception):
+                    pass
+            if reader is not None:
+                reader.close()
     
     async def test_connection(self) -> bool:
         """Test PostgreSQL connection."""
@@ -77,21 +264,27 @@ class PostgreSQLConnector(DatabaseConnector):
             return False
     
     async def get_schema(self, table_or_collection: str) -> Dict[str, str]:
-        """Get PostgreSQL table schema."""
+        """Get PostgreSQL table schema, cached per table for the connector's lifetime."""
+        cached = self._schema_cache.get(table_or_collection)
+        if cached is not None:
+            return cached
+
         if not self.pool:
             await self.connect()
-        
+
         query = """
             SELECT column_name, data_type
             FROM information_schema.columns
             WHERE table_name = $1
             ORDER BY ordinal_position
         """
-        
+
         try:
             async with self.pool.acquire() as connection:
                 rows = await connection.fetch(query, table_or_collection)
-                return {row['column_name']: row['data_type'] for row in rows}
+                schema = {row['column_name']: row['data_type'] for row in rows}
+                self._schema_cache[table_or_collection] = schema
+                return schema
         except Exception as e:
             logger.error(f"Error getting PostgreSQL schema: {e}")
             raise
@@ -1,18 +1,235 @@
 import chromadb
 from chromadb.config import Settings as ChromaSettings
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import logging
 import asyncio
+import os
+import sqlite3
+import threading
+import time
 import uuid
-import json
+import orjson
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Per-value cleaners for _clean_metadata, keyed by exact type so the
+# per-row hot loop does one dict lookup instead of an isinstance chain.
+# Values Chroma accepts natively pass through untouched.
+def _clean_passthrough(value):
+    return value
+
+
+def _clean_sequence(value):
+    return ", ".join(str(v) for v in value)
+
+
+def _clean_dict(value):
+    # OPT_NON_STR_KEYS keeps json.dumps' tolerance of e.g. int keys
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+_CHROMA_PRIMITIVES = frozenset((str, int, float, bool))
+
+_METADATA_CLEANERS = {
+    str: _clean_passthrough,
+    int: _clean_passthrough,
+    float: _clean_passthrough,
+    bool: _clean_passthrough,
+    list: _clean_sequence,
+    tuple: _clean_sequence,
+    dict: _clean_dict,
+}
+
+_torch_threads_pinned = False
+
+
+def pin_torch_threads() -> None:
+    """Pin torch/BLAS/tokenizer thread counts once per process.
+
+    Without this torch may default to a single intra-op thread and leave
+    cores idle during encode. Sizes thread teams to half the cores the
+    process is actually allowed to run on (sched_getaffinity respects
+    cgroup and taskset limits, unlike cpu_count) unless EMBED_THREADS
+    overrides it; oversubscribing hyperthreads with dense matmul work
+    just adds cache contention, and a single interop thread keeps torch
+    from spawning a second scheduler pool alongside the embedding
+    executor.
+    """
+    global _torch_threads_pinned
+    if _torch_threads_pinned:
+        return
+    _torch_threads_pinned = True
+
+    try:
+        cpu_count = len(os.sched_getaffinity(0))
+    except AttributeError:  # non-Linux
+        cpu_count = os.cpu_count() or 2
+    num_threads = settings.EMBED_THREADS or max(1, cpu_count // 2)
+
+    os.environ.setdefault("OMP_NUM_THREADS", str(num_threads))
+    os.environ.setdefault("MKL_NUM_THREADS", str(num_threads))
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+    import torch
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set before torch's interop pool starts; harmless
+        # if another component got there first
+        pass
+
+
+class EmbeddingCache:
+    """Persistent content-addressed cache of text embeddings.
+
+    Keys are blake2b digests of (model_name, text), so duplicate rows,
+    repeated queries and re-ingests skip the transformer forward pass,
+    and switching models invalidates everything automatically. Vectors
+    are quantized to symmetric int8 with a per-vector absmax scale
+    (4 bytes of scale + one byte per dimension), a quarter the size of
+    float32 with negligible recall impact on sentence embeddings. The
+    sqlite file needs no extra dependencies and lives beside the Chroma
+    data it complements.
+    """
+
+    def __init__(self, path: str, model_name: str):
+        self._model_prefix = model_name.encode() + b"\0"
+        # A single shared connection guarded by a lock: lookups happen in
+        # the embedding executor's worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB)"
+            )
+            self._conn.commit()
+
+    def key(self, text: str) -> bytes:
+        return hashlib.blake2b(self._model_prefix + text.encode()).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Fetch cached vectors for the given keys; misses are absent."""
+        found: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            # Chunk the IN list to stay under sqlite's parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk
+                )
+                for key, blob in rows:
+                    found[key] = self._decode(blob)
+        return found
+
+    @staticmethod
+    def _encode(vector) -> bytes:
+        arr = np.asarray(vector, dtype=np.float32)
+        scale = float(np.abs(arr).max()) / 127.0
+        if scale == 0.0:
+            quantized = np.zeros(arr.shape, dtype=np.int8)
+        else:
+            quantized = np.clip(np.round(arr / scale), -127, 127).astype(np.int8)
+        return np.float32(scale).tobytes() + quantized.tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes) -> np.ndarray:
+        scale = np.frombuffer(blob, dtype=np.float32, count=1)[0]
+        quantized = np.frombuffer(blob, dtype=np.int8, offset=4)
+        return quantized.astype(np.float32) * scale
+
+    def set_many(self, items: List[tuple]) -> None:
+        """Store (key, vector) pairs."""
+        rows = [(key, self._encode(vector)) for key, vector in items]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class QueryEmbedBatcher:
+    """Coalesces concurrent query embeddings into shared forward passes.
+
+    Queries arriving within MAX_WAIT_MS of each other are encoded in a
+    single batch; on transformer models a batch-16 forward pass costs only
+    about twice a batch-1 pass, so throughput under concurrent chat load
+    scales near-linearly instead of serializing per query.
+    """
+
+    MAX_BATCH = 32
+    MAX_WAIT_MS = 5.0
+
+    def __init__(self, encode_fn):
+        # encode_fn: async callable mapping List[str] -> List[List[float]]
+        self._encode_fn = encode_fn
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, text: str) -> List[float]:
+        """Submit a query for embedding; resolves when its batch finishes."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the background batching task."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block for the first query, then drain whatever else arrives
+            # within the batching window
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.MAX_WAIT_MS / 1000.0
+            while len(batch) < self.MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                vectors = await self._encode_fn([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
 class EmbeddingManager:
     """Manages embeddings and vector database operations."""
-    
+
+    # Rows per encode+insert chunk in add_documents; bounds peak vector
+    # memory at roughly chunk * dim * 4 bytes
+    ADD_CHUNK_SIZE = 8192
+
+    # How long a cached collection.count() stays valid for clamping
+    # search n_results; inserts through this manager update it directly
+    COUNT_REFRESH_SECONDS = 30.0
+
     def __init__(self):
         self.client = None
         self.collection = None
@@ -20,10 +237,27 @@ class EmbeddingManager:
         self.model_name = settings.EMBEDDING_MODEL
         self.persist_directory = settings.VECTOR_DB_PERSIST_DIR
         self.collection_name = settings.VECTOR_DB_COLLECTION
+        self._query_batcher = QueryEmbedBatcher(self._generate_embeddings)
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        self._approx_count: Optional[int] = None
+        self._count_ts = 0.0
+        # Dedicated single-worker executor for model inference so
+        # ingestion-sized encode jobs don't queue behind unrelated
+        # to_thread work (and vice versa). One worker is deliberate:
+        # torch parallelizes each forward pass across the pinned thread
+        # team already, so concurrent encodes would only fight over the
+        # same cores
+        self._embed_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="embed"
+        )
     
     async def initialize(self) -> None:
         """Initialize the embedding manager."""
         try:
+            pin_torch_threads()
+
+
             # Initialize ChromaDB client
             self.client = chromadb.PersistentClient(
                 path=self.persist_directory,
@@ -41,7 +275,22 @@ class EmbeddingManager:
             
             # Initialize embedding model
             await self._initialize_embedding_model()
-            
+
+            try:
+                # Quantized and full-precision models produce different
+                # vectors, so the flag is part of the cache identity
+                cache_model_id = self.model_name
+                if settings.EMBEDDING_QUANTIZE_INT8:
+                    cache_model_id += "#int8"
+                self._embedding_cache = EmbeddingCache(
+                    os.path.join(self.persist_directory, "embedding_cache.sqlite3"),
+                    cache_model_id
+                )
+            except (sqlite3.Error, OSError) as e:
+                # e.g. read-only persist dir; embeddings just recompute
+                logger.warning(f"Embedding cache unavailable: {e}")
+                self._embedding_cache = None
+
             logger.info(f"EmbeddingManager initialized with model: {self.model_name}")
             
         except Exception as e:
@@ -51,11 +300,25 @@ class EmbeddingManager:
     async def _initialize_embedding_model(self) -> None:
         """Initialize the sentence transformer model."""
         def load_model():
-            return SentenceTransformer(self.model_name)
-        
+            import torch
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            model = SentenceTransformer(self.model_name, device=device)
+            if device == "cuda" and settings.EMBED_FP16:
+                model = model.half()
+                logger.info("Embedding model running on CUDA in fp16")
+            if settings.EMBEDDING_QUANTIZE_INT8 and model.device.type == "cpu":
+                # Dynamic quantization swaps Linear weights to int8 with
+                # on-the-fly activation quantization — the standard
+                # sbert recipe for CPU inference speedups
+                model = torch.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                logger.info("Embedding model quantized to int8 for CPU inference")
+            return model
+
         # Load model in thread pool to avoid blocking
         loop = asyncio.get_event_loop()
-        self.embedding_model = await loop.run_in_executor(None, load_model)
+        self.embedding_model = await loop.run_in_executor(self._embed_executor, load_model)
     
     async def add_documents(
         self,
@@ -79,32 +342,58 @@ class EmbeddingManager:
             texts = []
             metadatas = []
             ids = []
-            
+
+            # One random batch id per call, then a row counter: Chroma
+            # only needs uniqueness within the collection, and this skips
+            # a urandom read plus hyphenated formatting per row
+            batch_id = uuid.uuid4().hex
+
             for doc in documents:
                 # Combine text fields for embedding
                 combined_text = self._combine_text_fields(doc, text_fields)
                 if not combined_text.strip():
                     continue
-                
+
                 texts.append(combined_text)
                 metadatas.append(self._clean_metadata(doc))
-                ids.append(str(uuid.uuid4()))
+                ids.append(f"{batch_id}-{len(ids)}")
             
             if not texts:
                 logger.warning("No valid texts found for embedding")
                 return 0
-            
-            # Generate embeddings
-            embeddings = await self._generate_embeddings(texts)
-            
-            # Add to ChromaDB
-            self.collection.add(
-                embeddings=embeddings,
-                documents=texts,
-                metadatas=metadatas,
-                ids=ids
+
+            # Stream chunks instead of embedding everything up front, so
+            # peak memory is one chunk of vectors rather than the whole
+            # ingest. Double-buffered: the next chunk encodes (in the
+            # embed executor) while the current one inserts (in a
+            # to_thread worker, keeping Chroma's disk work off the loop)
+            chunk = self.ADD_CHUNK_SIZE
+            encode_task = asyncio.create_task(
+                self._generate_embeddings(texts[:chunk])
             )
-            
+            for start in range(0, len(texts), chunk):
+                embeddings = await encode_task
+                end = start + chunk
+                if end < len(texts):
+                    encode_task = asyncio.create_task(
+                        self._generate_embeddings(texts[end:end + chunk])
+                    )
+                await asyncio.to_thread(
+                    self.collection.add,
+                    # Chroma 0.4's validator only accepts lists, so the
+                    # numpy pipeline converts exactly once at the boundary
+                    embeddings=[
+                        vector.tolist() if isinstance(vector, np.ndarray) else vector
+                        for vector in embeddings
+                    ],
+                    documents=texts[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end]
+                )
+
+            if self._approx_count is not None:
+                self._approx_count += len(texts)
+
             logger.info(f"Added {len(texts)} documents to vector database")
             return len(texts)
             
@@ -112,6 +401,17 @@ class EmbeddingManager:
             logger.error(f"Error adding documents to vector database: {e}")
             raise
     
+    async def embed_query(self, query: str) -> List[float]:
+        """Generate the embedding vector for a single query string.
+
+        Concurrent queries are micro-batched through QueryEmbedBatcher so
+        simultaneous users share a single model forward pass.
+        """
+        if not self.embedding_model:
+            raise ValueError("EmbeddingManager not properly initialized")
+
+        return await self._query_batcher.submit(query)
+
     async def search_similar(
         self,
         query: str,
@@ -119,25 +419,56 @@ class EmbeddingManager:
     ) -> List[Dict[str, Any]]:
         """
         Search for similar documents based on query.
-        
+
         Args:
             query: Search query
             n_results: Number of results to return
-            
+
+        Returns:
+            List of similar documents with metadata
+        """
+        query_embedding = await self.embed_query(query)
+        return await self.search_by_vector(query_embedding, n_results)
+
+    async def search_by_vector(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for similar documents given a precomputed query embedding.
+
+        Args:
+            query_embedding: Embedding vector of the query
+            n_results: Number of results to return
+
         Returns:
             List of similar documents with metadata
         """
         if not self.collection or not self.embedding_model:
             raise ValueError("EmbeddingManager not properly initialized")
-        
+
         try:
-            # Generate query embedding
-            query_embedding = await self._generate_embeddings([query])
-            
+            # Clamp against a cached count: collection.count() hits the
+            # sqlite metadata on every call, pure overhead per search.
+            # Inserts through add_documents keep the cache current; the
+            # TTL catches writers outside this process
+            now = time.monotonic()
+            if (
+                self._approx_count is None
+                or now - self._count_ts > self.COUNT_REFRESH_SECONDS
+            ):
+                self._approx_count = self.collection.count()
+                self._count_ts = now
+
+            # Chroma 0.4's validator only accepts lists, not ndarrays
+            if isinstance(query_embedding, np.ndarray):
+                query_embedding = query_embedding.tolist()
+
             # Search in ChromaDB
             results = self.collection.query(
-                query_embeddings=query_embedding,
-                n_results=min(n_results, self.collection.count())
+                query_embeddings=[query_embedding],
+                n_results=min(n_results, self._approx_count)
             )
             
             # Format results
@@ -161,47 +492,101 @@ class EmbeddingManager:
     
     def _combine_text_fields(self, document: Dict[str, Any], text_fields: List[str]) -> str:
         """Combine specified text fields into a single string."""
-        combined_parts = []
-        
-        for field in text_fields:
-            if field in document and document[field] is not None:
-                value = str(document[field]).strip()
-                if value:
-                    combined_parts.append(f"{field}: {value}")
-        
-        return " | ".join(combined_parts)
+        # Feed join from a generator: no intermediate list, and absent or
+        # empty fields are filtered without a second pass
+        return " | ".join(
+            f"{field}: {text}"
+            for field in text_fields
+            if (raw := document.get(field)) is not None and (text := str(raw).strip())
+        )
     
     def _clean_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Clean metadata to ensure compatibility with ChromaDB."""
+        # Records from well-typed sources are usually already flat
+        # primitives; one pass of type lookups beats building a new dict
+        if all(type(value) in _CHROMA_PRIMITIVES for value in metadata.values()):
+            return metadata
+
         cleaned = {}
         for key, value in metadata.items():
-            if isinstance(value, (list, tuple)):
-                # Convert lists/tuples to comma-separated strings
-                cleaned[key] = ", ".join(str(v) for v in value)
-            elif isinstance(value, dict):
-                # Convert dictionaries to JSON strings
-                cleaned[key] = json.dumps(value)
+            cleaner = _METADATA_CLEANERS.get(type(value))
+            if cleaner is not None:
+                cleaned[key] = cleaner(value)
             elif value is None:
                 # Skip None values
                 continue
             else:
-                # Keep primitive types as-is
-                cleaned[key] = str(value) if not isinstance(value, (str, int, float, bool)) else value
+                cleaned[key] = str(value)
         return cleaned
     
     async def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for texts using sentence transformer."""
+        """Generate embeddings for texts using sentence transformer.
+
+        Cached vectors are served from the content-addressed cache; only
+        the distinct uncached texts go through the model forward pass,
+        and their results are written back for future runs. Passing the
+        whole list to encode() lets sentence-transformers length-sort
+        internally, so minibatches pad to similar lengths instead of the
+        longest text in an arbitrary group; vectors stay numpy end to
+        end (Chroma and the quantizer both take arrays directly).
+        """
+        cache = self._embedding_cache
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+
+        def encode(batch):
+            return self.embedding_model.encode(
+                batch,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+
         def encode_texts():
-            return self.embedding_model.encode(texts, convert_to_tensor=False).tolist()
-        
-        # Generate embeddings in thread pool
+            if cache is None:
+                return list(encode(texts))
+
+            keys = [cache.key(text) for text in texts]
+            cached = cache.get_many(keys)
+
+            # Deduplicate misses so repeated rows are encoded once
+            miss_order: List[str] = []
+            miss_positions: Dict[bytes, List[int]] = {}
+            for i, key in enumerate(keys):
+                if key in cached:
+                    continue
+                if key not in miss_positions:
+                    miss_positions[key] = []
+                    miss_order.append(texts[i])
+                miss_positions[key].append(i)
+
+            results: List[Optional[np.ndarray]] = [cached.get(key) for key in keys]
+            if miss_order:
+                encoded = encode(miss_order)
+                for text, vector in zip(miss_order, encoded):
+                    for i in miss_positions[cache.key(text)]:
+                        results[i] = vector
+                try:
+                    cache.set_many([
+                        (cache.key(text), vector)
+                        for text, vector in zip(miss_order, encoded)
+                    ])
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not persist embedding cache entries: {e}")
+            return results
+
+        # Generate embeddings in the dedicated embedding thread pool
         loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(None, encode_texts)
+        embeddings = await loop.run_in_executor(self._embed_executor, encode_texts)
         return embeddings
     
     async def cleanup(self) -> None:
         """Cleanup resources."""
         # ChromaDB client doesn't need explicit cleanup
+        await self._query_batcher.close()
+        self._embed_executor.shutdown(wait=False)
+        if self._embedding_cache is not None:
+            self._embedding_cache.close()
+            self._embedding_cache = None
         logger.info("EmbeddingManager cleanup completed")
     
     def get_collection_stats(self) -> Dict[str, Any]:
@@ -1,11 +1,12 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 from typing import AsyncGenerator
-import json
 import uuid
+
+import orjson
 from datetime import datetime
 
 from .config import settings
@@ -14,7 +15,7 @@ from .models import (
     HealthResponse, IngestionStatus, StreamChunk,
     CSVConfig, CSVColumnConfig, CSVColumnType
 )
-from .database.factory import DatabaseFactory
+from .database.factory import db_factory
 from .embeddings.manager import EmbeddingManager
 from .ai.llm_factory import LLMFactory
 from .ai.base_client import BaseLLMClient
@@ -136,13 +137,17 @@ async def lifespan(app: FastAPI):
             await kafka_producer.stop()
         if redis_tracker:
             await redis_tracker.disconnect()
+        await db_factory.close_all()
 
 app = FastAPI(
     title="Plug-and-Play RAG API",
     description="Universal RAG system supporting multiple databases and LLM providers",
     version="1.0.0",
     docs_url="/docs",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes responses (sources lists, history dumps) several
+    # times faster than stdlib json and handles datetime natively
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -492,9 +497,9 @@ async def ingest_data(config: DataSourceConfig, background_tasks: BackgroundTask
     This runs in the background to avoid timeout issues.
     """
     try:
-        # Validate database connection
-        db_factory = DatabaseFactory()
-        db_connector = await db_factory.create_connector(config.db_type, config.connection_params)
+        # Validate database connection; the pooled connector is reused by
+        # the background ingest task
+        await db_factory.create_connector(config.db_type, config.connection_params)
         
         # Add ingestion task to background
         background_tasks.add_task(
@@ -532,10 +537,12 @@ async def chat_with_data_stream(request: ChatRequest):
     Chat with your data using RAG approach with streaming response.
     """
     try:
-        async def generate_stream() -> AsyncGenerator[str, None]:
+        async def generate_stream() -> AsyncGenerator[bytes, None]:
+            # orjson is several times faster than stdlib json; per-token
+            # serialization cost matters when the model streams small chunks
             async for chunk in rag_service.process_chat_request_stream(request):
-                yield f"data: {json.dumps(chunk)}\n\n"
-            yield "data: [DONE]\n\n"
+                yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+            yield b"data: [DONE]\n\n"
         
         return StreamingResponse(
             generate_stream(),
@@ -576,5 +583,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
-        log_level=settings.LOG_LEVEL.lower()
+        log_level=settings.LOG_LEVEL.lower(),
+        # libuv event loop; noticeably faster dispatch in the per-token
+        # streaming paths than the default selector loop
+        loop="uvloop"
     )
@@ -115,42 +115,42 @@ class DataIngestionWorker:
             processed_docs = 0
             
             # Stream data from database and send embedding requests
-            async for record in db_connector.get_data(
+            async for batch in db_connector.get_data(
                 message.table_or_collection,
                 message.columns_or_fields
             ):
-                total_docs += 1
-                
-                # Combine text fields for embedding
-                text_parts = []
-                for field in message.text_fields:
-                    if field in record and record[field]:
-                        text_parts.append(f"{field}: {record[field]}")
-                
-                combined_text = " | ".join(text_parts)
-                
-                if combined_text.strip():
-                    # Send embedding request
-                    embedding_msg = EmbeddingMessage(
-                        document_id=str(record.get('id', uuid.uuid4())),
-                        content=combined_text,
-                        metadata=record,
-                        batch_id=batch_id,
-                        timestamp=datetime.now()
-                    )
-                    
-                    await self.producer.send_embedding_request(embedding_msg)
-                    processed_docs += 1
-                
-                # Send periodic status updates
-                if total_docs % 100 == 0:
-                    await self.producer.send_batch_status(BatchStatusMessage(
-                        batch_id=batch_id,
-                        status="processing",
-                        total_documents=total_docs,
-                        processed_documents=processed_docs,
-                        timestamp=datetime.now()
-                    ))
+                for record in batch:
+                    total_docs += 1
+
+                    # Combine text fields for embedding
+                    text_parts = []
+                    for field in message.text_fields:
+                        if field in record and record[field]:
+                            text_parts.append(f"{field}: {record[field]}")
+
+                    combined_text = " | ".join(text_parts)
+
+                    if combined_text.strip():
+                        # Send embedding request
+                        embedding_msg = EmbeddingMessage(
+                            document_id=str(record.get('id', uuid.uuid4())),
+                            content=combined_text,
+                            metadata=record,
+                            batch_id=batch_id,
+                            timestamp=datetime.now()
+                        )
+
+                        await self.producer.send_embedding_request(embedding_msg)
+                        processed_docs += 1
+
+                # Send a status update per batch
+                await self.producer.send_batch_status(BatchStatusMessage(
+                    batch_id=batch_id,
+                    status="processing",
+                    total_documents=total_docs,
+                    processed_documents=processed_docs,
+                    timestamp=datetime.now()
+                ))
             
             # Cleanup database connection
             await db_connector.disconnect()
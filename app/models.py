@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional, Union
+from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 
@@ -30,11 +31,23 @@ class ChatMessage(BaseModel):
     content: str = Field(..., description="Message content")
     timestamp: datetime = Field(default_factory=datetime.now)
 
+@dataclass(slots=True)
+class Source:
+    """A retrieved context document attached to a chat response.
+
+    A slotted dataclass rather than a dict: one is built per retrieved
+    document per request, and slots cut the per-instance memory roughly
+    in half while orjson still serializes it natively.
+    """
+    content: str
+    metadata: Dict[str, Any]
+    relevance_score: Optional[float]
+
 class ChatResponse(BaseModel):
     """Response model for chat endpoints."""
     user_name: str
     response: str
-    sources: List[Dict[str, Any]] = Field(default_factory=list, description="Source documents used for context")
+    sources: List[Source] = Field(default_factory=list, description="Source documents used for context")
     timestamp: datetime = Field(default_factory=datetime.now)
 
 class StreamChunk(BaseModel):
@@ -86,3 +99,4 @@ class CSVConfig(BaseModel):
     chunk_size: int = Field(default=1000, description="Number of rows to process at once")
     skip_rows: int = Field(default=0, description="Number of rows to skip from beginning")
     max_rows: Optional[int] = Field(None, description="Maximum number of rows to process")
+    streaming: bool = Field(default=False, description="Stream chunks instead of loading the whole file")
@@ -344,21 +344,18 @@ class TestCSVRAGIntegration:
             text_fields=["title", "content"]
         )
         
-        with patch('app.chat.rag_service.DatabaseFactory') as mock_factory:
-            mock_factory.return_value.create_connector = AsyncMock(return_value=mock_csv_connector)
-            
-            await rag_service._ingest_csv_data(mock_csv_connector, config)
-            
-            # Verify documents were added
-            mock_embedding_manager.add_documents.assert_called_once()
-            call_args = mock_embedding_manager.add_documents.call_args
-            documents, metadatas = call_args[0]
-            
-            assert len(documents) == 2
-            assert "AI Basics Introduction to AI" in documents
-            assert "ML Guide Machine learning guide" in documents
-            assert len(metadatas) == 2
-            assert metadatas[0]["source"] == "csv"
+        await rag_service._ingest_csv_data(mock_csv_connector, config)
+
+        # Verify documents were added
+        mock_embedding_manager.add_documents.assert_called_once()
+        call_args = mock_embedding_manager.add_documents.call_args
+        documents, metadatas = call_args[0]
+
+        assert len(documents) == 2
+        assert "AI Basics Introduction to AI" in documents
+        assert "ML Guide Machine learning guide" in documents
+        assert len(metadatas) == 2
+        assert metadatas[0]["source"] == "csv"
 
     @pytest.mark.asyncio
     async def test_csv_data_with_empty_text(self, mock_csv_connector):
@@ -2,6 +2,7 @@
 Unit tests for LLM Factory and clients
 """
 
+import orjson
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from app.ai.llm_factory import LLMFactory
@@ -149,7 +150,7 @@ class TestCustomLLMClient:
     async def test_custom_client_generate_response(self, mock_post):
         """Test generating response with custom client."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "choices": [
                 {
                     "message": {
@@ -157,7 +158,7 @@ class TestCustomLLMClient:
                     }
                 }
             ]
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
         